@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from django_lexorank.lexorank import LexoRank
+from tests.fixtures import *  # noqa: F401, F403
+from tests.models import Board, Task
+
+BENCHMARK_SIZES = [
+    int(size) for size in os.environ.get("LEXORANK_BENCHMARK_SIZES", "1000").split(",")
+]
+
+
+@pytest.fixture(autouse=True)
+def enable_db_access_for_all_benchmarks(db):
+    pass
+
+
+@pytest.fixture
+def ranked_boards_factory():
+    def create_boards(objects_count: int):
+        Board.objects.bulk_create(
+            (
+                Board(name=f"board_{i}", rank=rank)
+                for i, rank in enumerate(LexoRank.get_rank_sequence(objects_count))
+            ),
+            batch_size=10_000,
+        )
+
+    return create_boards
+
+
+@pytest.fixture
+def ranked_tasks_factory(user):
+    def create_tasks(board: Board, objects_count: int):
+        Task.objects.bulk_create(
+            (
+                Task(name=f"task_{i}", rank=rank, board=board, assigned_to=user)
+                for i, rank in enumerate(LexoRank.get_rank_sequence(objects_count))
+            ),
+            batch_size=10_000,
+        )
+
+    return create_tasks
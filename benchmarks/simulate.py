@@ -0,0 +1,317 @@
+"""
+Trace-replay simulator for choosing rank geometry offline.
+
+Replays a JSONL trace of inserts and moves per group against in-memory sorted
+lists, without a database, for each candidate `LexoRank` configuration, and
+reports rank length distribution over time, number of rebalances and their sizes:
+
+    python -m benchmarks.simulate trace.jsonl \
+        --config rebalancing_length=64 \
+        --config rebalancing_length=128,default_rank_length=8
+
+Each trace line is an event for an object `id` in a `group`:
+
+    {"op": "insert", "group": "board-1", "id": "task-1", "top": true}
+    {"op": "move", "id": "task-1", "after": "task-7"}
+    {"op": "move", "id": "task-1", "group": "board-2", "before": "task-9"}
+    {"op": "delete", "id": "task-1"}
+
+Objects are placed `after` or `before` another object of the group, on the `top`
+or `bottom` of it (the default). Use `--synthetic N` instead of a trace file
+to replay N generated events.
+"""
+import argparse
+import bisect
+import json
+import random
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from django_lexorank.lexorank import LexoRank
+
+CONFIG_TYPES = {
+    "default_rank_length": int,
+    "rebalancing_length": int,
+    "max_rank_length": int,
+    "base_symbols": str,
+}
+
+
+def make_lexorank(**config) -> Type[LexoRank]:
+    """Return a `LexoRank` subclass with provided class attributes."""
+    attributes = dict(config)
+    if "base_symbols" in config:
+        # Ranks are ordered as plain strings, so symbols must be unique and sorted.
+        symbols = config["base_symbols"]
+        if list(symbols) != sorted(set(symbols)):
+            raise ValueError("base_symbols must be unique and sorted by code point.")
+        attributes.update(
+            first_symbol=config["base_symbols"][0],
+            last_symbol=config["base_symbols"][-1],
+            base=len(config["base_symbols"]),
+        )
+    return type("LexoRank", (LexoRank,), attributes)
+
+
+def parse_config(config: str) -> Dict[str, object]:
+    parsed = {}
+    for item in config.split(","):
+        name, _, value = item.partition("=")
+        if name not in CONFIG_TYPES:
+            raise ValueError(f"Unknown configuration parameter: {name}")
+        parsed[name] = CONFIG_TYPES[name](value)
+    return parsed
+
+
+def read_trace(path: str) -> Iterator[dict]:
+    with open(path) as trace:
+        for line in trace:
+            if line.strip():
+                yield json.loads(line)
+
+
+def generate_trace(
+    events: int,
+    groups: int = 10,
+    move_fraction: float = 0.7,
+    top_fraction: float = 0.3,
+    seed: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Yield synthetic events: inserts to the top or bottom of random groups and
+    moves of random objects, `top_fraction` of them to the top of the group.
+    """
+    generator = random.Random(seed)
+    objects: Dict[str, List[str]] = {f"group-{i}": [] for i in range(groups)}
+
+    for i in range(events):
+        group = generator.choice(list(objects))
+        members = objects[group]
+
+        if len(members) < 2 or generator.random() >= move_fraction:
+            object_id = f"object-{i}"
+            members.append(object_id)
+            top = generator.random() < top_fraction
+            yield {"op": "insert", "group": group, "id": object_id, "top": top}
+            continue
+
+        object_id, target_id = generator.sample(members, 2)
+        if generator.random() < top_fraction:
+            yield {"op": "move", "id": object_id, "top": True}
+        else:
+            yield {"op": "move", "id": object_id, "after": target_id}
+
+
+class Simulation:
+    """
+    Ranked lists kept as sorted `(rank, id)` lists per group, placing objects
+    like `RankedModel` does and rebalancing a group right after a rank reaches
+    `rebalancing_length`, as processing scheduled rebalancing would.
+    """
+
+    def __init__(self, lexorank: Type[LexoRank]) -> None:
+        self.lexorank = lexorank
+        self.groups: Dict[str, List[Tuple[str, str]]] = {}
+        self.objects: Dict[str, Tuple[str, str]] = {}
+        self.rebalance_sizes: List[int] = []
+
+    def get_rank_lengths(self) -> Counter:
+        return Counter(len(rank) for rank, _ in self.objects.values())
+
+    def remove(self, object_id: str) -> str:
+        group, rank = self.objects.pop(object_id)
+        entries = self.groups[group]
+        del entries[bisect.bisect_left(entries, (rank, object_id))]
+        return group
+
+    def get_neighbour_ranks(
+        self, group: str, event: dict
+    ) -> Tuple[Optional[str], Optional[str]]:
+        entries = self.groups.setdefault(group, [])
+
+        if "after" in event or "before" in event:
+            target_id = event.get("after", event.get("before"))
+            target_rank = self.objects[target_id][1]
+            index = bisect.bisect_left(entries, (target_rank, target_id))
+            if "after" in event:
+                following = entries[index + 1][0] if index + 1 < len(entries) else None
+                return target_rank, following
+            preceding = entries[index - 1][0] if index > 0 else None
+            return preceding, target_rank
+
+        if event.get("top"):
+            return None, entries[0][0] if entries else None
+
+        return entries[-1][0] if entries else None, None
+
+    def place(self, object_id: str, group: str, event: dict) -> None:
+        objects_count = len(self.groups.get(group, [])) + 1
+
+        # If there is no space left in the gap, the group is rebalanced once;
+        # if the gap is still too small, the configuration cannot hold the group.
+        for attempt in range(2):
+            previous_rank, next_rank = self.get_neighbour_ranks(group, event)
+            try:
+                rank = self.lexorank.get_lexorank_in_between(
+                    previous_rank=previous_rank,
+                    next_rank=next_rank,
+                    objects_count=objects_count,
+                )
+                break
+            except ValueError:
+                if attempt:
+                    raise
+                self.rebalance(group)
+
+        bisect.insort(self.groups[group], (rank, object_id))
+        self.objects[object_id] = (group, rank)
+
+        if len(rank) >= self.lexorank.rebalancing_length:
+            self.rebalance(group)
+
+    def rebalance(self, group: str) -> None:
+        entries = self.groups[group]
+        ranks = self.lexorank.get_rank_sequence(objects_count=len(entries))
+        self.groups[group] = [
+            (rank, object_id) for rank, (_, object_id) in zip(ranks, entries)
+        ]
+        for rank, object_id in self.groups[group]:
+            self.objects[object_id] = (group, rank)
+        self.rebalance_sizes.append(len(entries))
+
+    def apply(self, event: dict) -> None:
+        operation = event["op"]
+        object_id = str(event["id"])
+
+        if operation == "insert":
+            self.place(object_id, str(event["group"]), event)
+        elif operation == "move":
+            group = self.remove(object_id)
+            self.place(object_id, str(event.get("group", group)), event)
+        elif operation == "delete":
+            self.remove(object_id)
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+
+
+def get_length_stats(lengths: Counter) -> dict:
+    total = sum(lengths.values())
+    if not total:
+        return {"objects": 0, "p50": None, "p99": None, "max": None, "mean": None}
+
+    def percentile(fraction: float) -> int:
+        position, seen = fraction * total, 0
+        for length in sorted(lengths):
+            seen += lengths[length]
+            if seen >= position:
+                return length
+        return max(lengths)
+
+    return {
+        "objects": total,
+        "p50": percentile(0.5),
+        "p99": percentile(0.99),
+        "max": max(lengths),
+        "mean": round(sum(k * v for k, v in lengths.items()) / total, 2),
+    }
+
+
+def simulate(events: Iterable[dict], config: dict, window: int = 10_000) -> dict:
+    """
+    Replay events with the configuration and return rank length statistics
+    every `window` events, with the number and sizes of rebalances.
+    """
+    simulation = Simulation(make_lexorank(**config))
+    timeline = []
+
+    events_count = 0
+    for events_count, event in enumerate(events, start=1):
+        simulation.apply(event)
+        if events_count % window == 0:
+            timeline.append(
+                {
+                    "events": events_count,
+                    "rebalances": len(simulation.rebalance_sizes),
+                    **get_length_stats(simulation.get_rank_lengths()),
+                }
+            )
+
+    sizes = simulation.rebalance_sizes
+    return {
+        "config": config,
+        "events": events_count,
+        "rebalances": len(sizes),
+        "rebalanced_objects": sum(sizes),
+        "max_rebalance_size": max(sizes, default=0),
+        "mean_rebalance_size": round(sum(sizes) / len(sizes), 1) if sizes else 0,
+        "rank_lengths": get_length_stats(simulation.get_rank_lengths()),
+        "timeline": timeline,
+    }
+
+
+def print_results(results: List[dict], timeline: bool = False) -> None:
+    for result in results:
+        config = ", ".join(f"{k}={v}" for k, v in result["config"].items())
+        lengths = result["rank_lengths"]
+        print(f"[{config or 'defaults'}]")
+        print(
+            f"  rebalances: {result['rebalances']} "
+            f"({result['rebalanced_objects']} objects, "
+            f"mean {result['mean_rebalance_size']}, "
+            f"max {result['max_rebalance_size']})"
+        )
+        print(
+            f"  rank length: p50 {lengths['p50']}, p99 {lengths['p99']}, "
+            f"max {lengths['max']}, mean {lengths['mean']}"
+        )
+        if timeline:
+            for point in result["timeline"]:
+                print(
+                    f"    {point['events']:>10} events: "
+                    f"p50 {point['p50']}, p99 {point['p99']}, max {point['max']}, "
+                    f"{point['rebalances']} rebalances"
+                )
+
+
+def main(argv: Optional[List[str]] = None) -> List[dict]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("trace", nargs="?", help="JSONL trace file.")
+    parser.add_argument("--synthetic", type=int, help="Number of generated events.")
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--config",
+        action="append",
+        default=[],
+        help="Comma-separated LexoRank attributes, e.g. rebalancing_length=64.",
+    )
+    parser.add_argument("--window", type=int, default=10_000, help="Timeline step.")
+    parser.add_argument("--timeline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Output JSON.")
+    options = parser.parse_args(argv)
+
+    if bool(options.trace) == bool(options.synthetic):
+        parser.error("Provide either a trace file or --synthetic.")
+
+    def get_events() -> Iterator[dict]:
+        if options.trace:
+            return read_trace(options.trace)
+        return generate_trace(
+            options.synthetic, groups=options.groups, seed=options.seed
+        )
+
+    configs = [parse_config(config) for config in options.config] or [{}]
+    results = [
+        simulate(get_events(), config, window=options.window) for config in configs
+    ]
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results, timeline=options.timeline)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
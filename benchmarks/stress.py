@@ -0,0 +1,425 @@
+"""
+Concurrent drag-traffic stress harness.
+
+Runs a weighted mix of ranking operations against the test models from many
+threads or processes and reports throughput, latency percentiles, time spent
+in write statements (including waits for locks), lock errors, duplicate ranks
+and the maximum rank length:
+
+    python -m benchmarks.stress --workers 8 --duration 30 \
+        --mix place_after=50,place_on_top=15,add_to_bottom=20,move_to_group=10
+
+It uses a SQLite database file in WAL mode, or PostgreSQL if
+`LEXORANK_BENCHMARK_DATABASE=postgresql` is set (see `benchmarks/settings.py`).
+Existing rows of the test models are deleted.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+DEFAULT_MIX = (
+    "place_after=50,place_on_top=15,add_to_bottom=20,move_to_group=10,rebalance=5"
+)
+
+# Errors raised by SQLite and PostgreSQL when a statement waits for a lock
+# for too long or is chosen as a deadlock victim.
+LOCK_ERROR_MESSAGES = [
+    "database is locked",
+    "database table is locked",
+    "deadlock detected",
+    "could not serialize access",
+    "lock timeout",
+]
+
+
+# Statements that wait for locks held by other writers. SQLite takes the write
+# lock on `BEGIN IMMEDIATE` already, if the transaction mode is set.
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "BEGIN")
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for item in mix.split(","):
+        operation, _, weight = item.partition("=")
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        weights[operation] = int(weight or 1)
+    return weights
+
+
+def get_random_object(queryset, generator: random.Random):
+    count = queryset.count()
+    if not count:
+        return None
+
+    return queryset.order_by("pk")[generator.randrange(count)]
+
+
+def get_random_task(board_ids: List[int], generator: random.Random):
+    from tests.models import Task
+
+    board_id = generator.choice(board_ids)
+    return get_random_object(Task.objects.filter(board_id=board_id), generator)
+
+
+def place_after(board_ids: List[int], generator: random.Random) -> None:
+    task = get_random_task(board_ids, generator)
+    if task is None:
+        return
+
+    after_task = get_random_object(
+        task._model.objects.filter(board_id=task.board_id).exclude(pk=task.pk),
+        generator,
+    )
+    if after_task is not None:
+        task.place_after(after_task)
+
+
+def place_on_top(board_ids: List[int], generator: random.Random) -> None:
+    task = get_random_task(board_ids, generator)
+    if task is not None:
+        task.place_on_top()
+
+
+def add_to_bottom(board_ids: List[int], generator: random.Random) -> None:
+    from tests.models import Board, Task, User
+
+    Task.objects.add_to_bottom(
+        name="stress",
+        board=Board(pk=generator.choice(board_ids)),
+        assigned_to=User.objects.order_by("pk").first(),
+    )
+
+
+def move_to_group(board_ids: List[int], generator: random.Random) -> None:
+    task = get_random_task(board_ids, generator)
+    if task is not None:
+        task.move_to_group(generator.choice(board_ids))
+
+
+def rebalance(board_ids: List[int], generator: random.Random) -> None:
+    task = get_random_task(board_ids, generator)
+    if task is not None:
+        task.rebalance()
+
+
+OPERATIONS = {
+    "place_after": place_after,
+    "place_on_top": place_on_top,
+    "add_to_bottom": add_to_bottom,
+    "move_to_group": move_to_group,
+    "rebalance": rebalance,
+}
+
+
+class WriteTimer:
+    """
+    Database execute wrapper adding up time spent in write statements, which
+    includes waiting for locks held by other workers, whether the statement
+    succeeds or fails.
+    """
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        statement = sql.lstrip().upper()
+        if not statement.startswith(WRITE_STATEMENTS) and "FOR UPDATE" not in statement:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+def is_lock_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(lock_message in message for lock_message in LOCK_ERROR_MESSAGES)
+
+
+def run_worker(
+    mix: Dict[str, int],
+    board_ids: List[int],
+    duration: float,
+    max_operations: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> dict:
+    """
+    Run randomly chosen operations until `duration` seconds pass or
+    `max_operations` operations are run, and return latencies per operation,
+    time spent in write statements and in operations failed with lock errors,
+    and the number of lock and other errors.
+    """
+    from django.db import DatabaseError, connection
+
+    operation_names = list(mix)
+    weights = list(mix.values())
+    generator = random.Random(seed)
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    lock_errors: Dict[str, int] = defaultdict(int)
+    lock_error_time, errors = 0.0, 0
+    deadline = time.perf_counter() + duration
+    operations = 0
+    write_timer = WriteTimer()
+
+    with connection.execute_wrapper(write_timer):
+        while time.perf_counter() < deadline and (
+            max_operations is None or operations < max_operations
+        ):
+            operation = generator.choices(operation_names, weights)[0]
+            started = time.perf_counter()
+            try:
+                OPERATIONS[operation](board_ids, generator)
+            except DatabaseError as error:
+                if not is_lock_error(error):
+                    raise
+                lock_errors[operation] += 1
+                lock_error_time += time.perf_counter() - started
+            except ValueError:
+                # Rank space of a gap is exhausted until the group is rebalanced.
+                errors += 1
+            else:
+                latencies[operation].append(time.perf_counter() - started)
+            operations += 1
+
+    return {
+        "latencies": dict(latencies),
+        "lock_errors": dict(lock_errors),
+        "lock_error_time": lock_error_time,
+        "write_time": write_timer.seconds,
+        "errors": errors,
+    }
+
+
+def run_worker_in_thread(*args) -> dict:
+    from django.db import connections
+
+    try:
+        return run_worker(*args)
+    finally:
+        connections.close_all()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def get_rank_report() -> dict:
+    from tests.models import Task
+
+    stats = Task.get_rank_stats()
+    return {
+        "duplicate_ranks": sum(row["duplicate_ranks"] for row in stats),
+        "max_rank_length": max((row["max_rank_length"] for row in stats), default=0),
+    }
+
+
+def make_report(results: List[dict], elapsed: float) -> dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    lock_errors: Dict[str, int] = defaultdict(int)
+    for result in results:
+        for operation, values in result["latencies"].items():
+            latencies[operation].extend(values)
+        for operation, count in result["lock_errors"].items():
+            lock_errors[operation] += count
+
+    operations_count = sum(len(values) for values in latencies.values())
+    all_latencies = [value for values in latencies.values() for value in values]
+
+    def latency_report(values: List[float]) -> dict:
+        if not values:
+            return {"count": 0, "p50_ms": None, "p99_ms": None}
+
+        return {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 0.5) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        }
+
+    return {
+        "operations": operations_count,
+        "throughput": round(operations_count / elapsed, 1) if elapsed else 0.0,
+        "latency": latency_report(all_latencies),
+        "per_operation": {
+            operation: {
+                **latency_report(latencies[operation]),
+                "lock_errors": lock_errors[operation],
+            }
+            for operation in sorted({*latencies, *lock_errors})
+        },
+        "lock_errors": sum(lock_errors.values()),
+        "lock_error_s": round(sum(result["lock_error_time"] for result in results), 3),
+        "write_s": round(sum(result["write_time"] for result in results), 3),
+        "errors": sum(result["errors"] for result in results),
+        **get_rank_report(),
+    }
+
+
+def seed_data(groups: int, objects_count: int) -> List[int]:
+    """Replace test models' rows with `groups` boards of `objects_count` tasks."""
+    from django_lexorank.lexorank import LexoRank
+    from tests.models import Board, Task, Team, User
+
+    Task.objects.all().delete()
+    Board.objects.all().delete()
+    User.objects.all().delete()
+    Team.objects.all().delete()
+
+    user = User.objects.create(name="stress", team=Team.objects.create(name="stress"))
+    Board.objects.bulk_create(
+        Board(name=f"board_{i}", rank=rank)
+        for i, rank in enumerate(LexoRank.get_rank_sequence(groups))
+    )
+    # Primary keys are not returned by bulk_create() on every backend.
+    board_ids = list(Board.objects.order_by("pk").values_list("pk", flat=True))
+
+    for board_id in board_ids:
+        Task.objects.bulk_create(
+            (
+                Task(name=f"task_{i}", rank=rank, board_id=board_id, assigned_to=user)
+                for i, rank in enumerate(LexoRank.get_rank_sequence(objects_count))
+            ),
+            batch_size=10_000,
+        )
+
+    return board_ids
+
+
+def run_stress(
+    mix: Dict[str, int],
+    board_ids: List[int],
+    workers: int = 1,
+    duration: float = 10.0,
+    max_operations: Optional[int] = None,
+    processes: bool = False,
+    seed: Optional[int] = None,
+) -> dict:
+    """Run workers concurrently against the configured database and report results."""
+    started = time.perf_counter()
+    arguments = [
+        (mix, board_ids, duration, max_operations, None if seed is None else seed + i)
+        for i in range(workers)
+    ]
+
+    if workers == 1 and not processes:
+        results = [run_worker(*arguments[0])]
+    elif processes:
+        # Spawned processes do not inherit open database connections.
+        with ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=setup_django,
+        ) as executor:
+            results = list(executor.map(run_worker, *zip(*arguments)))
+    else:
+        with ThreadPoolExecutor(workers) as executor:
+            results = list(executor.map(run_worker_in_thread, *zip(*arguments)))
+
+    return make_report(results, time.perf_counter() - started)
+
+
+def enable_sqlite_wal(sender, connection, **kwargs) -> None:
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+
+
+def setup_django(sqlite_path: Optional[str] = None) -> None:
+    import django
+    from django.conf import settings
+    from django.db.backends.signals import connection_created
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    sqlite_path = sqlite_path or os.environ.get("LEXORANK_STRESS_SQLITE_PATH")
+    if sqlite_path and not settings.configured:
+        # Settings are loaded lazily, so the path can be changed before setup.
+        settings.DATABASES["default"]["NAME"] = sqlite_path
+
+    django.setup()
+    connection_created.connect(enable_sqlite_wal)
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--processes", action="store_true", help="Use processes.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds.")
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--objects", type=int, default=1000, help="Per group.")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--jitter-digits", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--sqlite-path",
+        default=os.path.join(tempfile.gettempdir(), "lexorank_stress.sqlite3"),
+    )
+    parser.add_argument("--json", action="store_true", help="Output JSON.")
+    options = parser.parse_args(argv)
+
+    # Worker processes set up Django from the environment.
+    os.environ["LEXORANK_STRESS_SQLITE_PATH"] = options.sqlite_path
+    setup_django(options.sqlite_path)
+
+    from django.core.management import call_command
+
+    from tests.models import Task
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    board_ids = seed_data(groups=options.groups, objects_count=options.objects)
+
+    if options.jitter_digits is not None:
+        if options.processes:
+            parser.error("--jitter-digits is not supported with --processes")
+        Task._meta.get_field("rank").jitter_digits = options.jitter_digits
+
+    report = run_stress(
+        mix=parse_mix(options.mix),
+        board_ids=board_ids,
+        workers=options.workers,
+        duration=options.duration,
+        processes=options.processes,
+        seed=options.seed,
+    )
+
+    if options.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"operations:       {report['operations']}")
+    print(f"throughput:       {report['throughput']} ops/s")
+    print(
+        f"latency:          p50 {report['latency']['p50_ms']} ms, "
+        f"p99 {report['latency']['p99_ms']} ms"
+    )
+    for operation, stats in report["per_operation"].items():
+        print(
+            f"  {operation:<15} {stats['count']:>7} ops, "
+            f"p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms, "
+            f"{stats['lock_errors']} lock errors"
+        )
+    print(f"write statements: {report['write_s']} s, including lock waits")
+    print(f"lock errors:      {report['lock_errors']} ({report['lock_error_s']} s)")
+    print(f"other errors:     {report['errors']}")
+    print(f"duplicate ranks:  {report['duplicate_ranks']}")
+    print(f"max rank length:  {report['max_rank_length']}")
+
+
+if __name__ == "__main__":
+    main()
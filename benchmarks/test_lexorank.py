@@ -0,0 +1,150 @@
+from typing import List, Optional, Tuple
+
+import pytest
+
+from django_lexorank.lexorank import LexoRank, Rank
+
+
+def insert_until_rebalancing_required(pattern: str) -> int:
+    """
+    Insert objects according to the pattern until the rank length
+    reaches `LexoRank.rebalancing_length` and return the number of inserts.
+    """
+    previous_rank = None
+    next_rank = None
+
+    if pattern == "after_same_object":
+        previous_rank = "hhhhhh"
+        next_rank = "tttttt"
+
+    inserts = 0
+    rank = ""
+    while len(rank) < LexoRank.rebalancing_length:
+        rank = LexoRank.get_lexorank_in_between(
+            previous_rank=previous_rank,
+            next_rank=next_rank,
+            objects_count=inserts + 2,
+        )
+        inserts += 1
+
+        if pattern == "bottom":
+            previous_rank = rank
+        else:
+            next_rank = rank
+
+    return inserts
+
+
+def simulate_concurrent_top_inserts(
+    writers: int, rounds: int, jitter_digits: Optional[int]
+) -> Tuple[int, int]:
+    """
+    Insert objects at the top of a list in rounds where all writers read
+    the first rank before any of them writes, like concurrent requests do.
+    Return the number of duplicate ranks and the maximum rank length.
+    """
+    ranks: List[str] = []
+    first_rank = None
+
+    for _ in range(rounds):
+        objects_count = len(ranks) + writers
+        if jitter_digits is None:
+            new_ranks = [
+                LexoRank.get_lexorank_in_between(None, first_rank, objects_count)
+            ] * writers
+        else:
+            new_ranks = [
+                LexoRank.get_random_lexorank_in_between(
+                    None, first_rank, objects_count, entropy_digits=jitter_digits
+                )
+                for _ in range(writers)
+            ]
+        ranks.extend(new_ranks)
+        first_rank = min(new_ranks)
+
+    return len(ranks) - len(set(ranks)), max(map(len, ranks))
+
+
+@pytest.mark.parametrize("jitter_digits", [None, 1, 2, 3])
+def test_concurrent_top_inserts_collisions(benchmark, jitter_digits):
+    writers, rounds = 8, 50
+
+    duplicates, max_rank_length = benchmark(
+        simulate_concurrent_top_inserts, writers, rounds, jitter_digits
+    )
+
+    collision_rate = duplicates / (writers * rounds)
+    benchmark.extra_info["collision_rate"] = collision_rate
+    benchmark.extra_info["max_rank_length"] = max_rank_length
+    if jitter_digits is None:
+        assert collision_rate == (writers - 1) / writers
+    elif jitter_digits >= 2:
+        assert collision_rate < 0.05
+
+
+@pytest.mark.parametrize("rank_length", [6, 64, 127])
+def test_get_lexorank_in_between(benchmark, rank_length):
+    previous_rank = "b" * rank_length
+    next_rank = "y" * rank_length
+
+    rank = benchmark(
+        LexoRank.get_lexorank_in_between,
+        previous_rank=previous_rank,
+        next_rank=next_rank,
+        objects_count=1000,
+    )
+
+    assert previous_rank < rank < next_rank
+
+
+def test_increment_rank(benchmark):
+    rank = LexoRank.get_min_rank(objects_count=1000)
+
+    new_rank = benchmark(LexoRank.increment_rank, rank=rank, objects_count=1000)
+
+    assert new_rank > rank
+
+
+def test_rank_midpoint(benchmark):
+    previous_rank = Rank("b" * 6)
+    next_rank = Rank("y" * 6)
+
+    rank = benchmark(previous_rank.midpoint, next_rank)
+
+    assert previous_rank < rank < next_rank
+
+
+def test_rank_to_int(benchmark):
+    value = benchmark(LexoRank.rank_to_int, "hzzzzz")
+
+    assert LexoRank.int_to_rank(value, 6) == "hzzzzz"
+
+
+@pytest.mark.parametrize("objects_count", [1_000, 100_000])
+def test_rank_sequence_generation(benchmark, objects_count):
+    ranks = benchmark(lambda: list(LexoRank.iter_ranks(objects_count=objects_count)))
+
+    assert ranks[-1] < LexoRank.get_max_rank(objects_count=objects_count)
+
+
+@pytest.mark.parametrize("objects_count", [1_000, 100_000, 1_000_000])
+def test_vectorised_rank_sequence_generation(benchmark, objects_count):
+    ranks = benchmark(LexoRank.get_rank_sequence, objects_count=objects_count)
+
+    assert ranks[-1] < LexoRank.get_max_rank(objects_count=objects_count)
+
+
+@pytest.mark.parametrize("objects_count", [1_000_000])
+def test_rank_sequence_buffer_generation(benchmark, objects_count):
+    buffer = benchmark(LexoRank.get_rank_sequence_buffer, objects_count=objects_count)
+
+    rank_length = LexoRank.get_rank_length(objects_count=objects_count)
+    assert len(buffer) == objects_count * rank_length
+
+
+@pytest.mark.parametrize("pattern", ["top", "bottom", "after_same_object"])
+def test_rank_length_growth(benchmark, pattern):
+    inserts = benchmark(insert_until_rebalancing_required, pattern)
+
+    benchmark.extra_info["inserts_until_rebalancing"] = inserts
+    assert inserts > LexoRank.rebalancing_length
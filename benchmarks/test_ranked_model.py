@@ -0,0 +1,92 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.models import Board, Task
+
+from .conftest import BENCHMARK_SIZES
+
+GROUP_SIZE = 1000
+ROUNDS = 50
+
+# Upper bounds of queries per operation on a group, including the
+# SAVEPOINT/RELEASE pair issued by `save()` running in a nested transaction.
+MAX_QUERIES = {
+    "create": 6,
+    "add_to_top": 6,
+    "add_to_bottom": 6,
+    "place_on_top": 6,
+    "place_on_bottom": 6,
+    "place_after": 6,
+    "place_before": 6,
+}
+
+
+@pytest.fixture
+def group(board, ranked_tasks_factory):
+    ranked_tasks_factory(board, GROUP_SIZE)
+    return list(Task.objects.filter(board=board).order_by("rank"))
+
+
+def run_operation(operation, group, board, user):
+    if operation == "create":
+        return Task.objects.create(name="task", board=board, assigned_to=user)
+    if operation == "add_to_top":
+        return Task.objects.add_to_top(name="task", board=board, assigned_to=user)
+    if operation == "add_to_bottom":
+        return Task.objects.add_to_bottom(name="task", board=board, assigned_to=user)
+    if operation == "place_on_top":
+        return group[GROUP_SIZE // 2].place_on_top()
+    if operation == "place_on_bottom":
+        return group[GROUP_SIZE // 2].place_on_bottom()
+    if operation == "place_after":
+        return group[0].place_after(after_obj=group[GROUP_SIZE // 2])
+    if operation == "place_before":
+        return group[0].place_before(before_obj=group[GROUP_SIZE // 2])
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+@pytest.mark.parametrize("operation", MAX_QUERIES)
+def test_operation_query_count(benchmark, operation, group, board, user):
+    with CaptureQueriesContext(connection) as context:
+        run_operation(operation, group, board, user)
+
+    benchmark.extra_info["queries"] = len(context.captured_queries)
+    assert len(context.captured_queries) <= MAX_QUERIES[operation]
+
+    benchmark.pedantic(
+        run_operation, args=(operation, group, board, user), rounds=ROUNDS
+    )
+
+
+@pytest.mark.parametrize("objects_count", BENCHMARK_SIZES)
+def test_rebalance(benchmark, objects_count, ranked_boards_factory):
+    ranked_boards_factory(objects_count)
+    board = Board.objects.order_by("rank").first()
+
+    with CaptureQueriesContext(connection) as context:
+        board.rebalance()
+
+    benchmark.extra_info["queries"] = len(context.captured_queries)
+    benchmark.pedantic(board.rebalance, rounds=3)
+
+
+@pytest.mark.parametrize("objects_count", BENCHMARK_SIZES)
+def test_queryset_iteration(benchmark, objects_count, ranked_boards_factory):
+    ranked_boards_factory(objects_count)
+
+    boards = benchmark.pedantic(lambda: list(Board.objects.all()), rounds=3)
+
+    assert len(boards) == objects_count
+
+
+@pytest.mark.parametrize("objects_count", BENCHMARK_SIZES)
+def test_rebalance_in_database(benchmark, objects_count, ranked_boards_factory):
+    ranked_boards_factory(objects_count)
+    board = Board.objects.order_by("rank").first()
+
+    with CaptureQueriesContext(connection) as context:
+        board.rebalance(in_database=True)
+
+    benchmark.extra_info["queries"] = len(context.captured_queries)
+    benchmark.pedantic(board.rebalance, kwargs={"in_database": True}, rounds=3)
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from benchmarks.simulate import (
+    Simulation,
+    generate_trace,
+    main,
+    make_lexorank,
+    simulate,
+)
+
+
+def test_simulation_keeps_ranks_sorted_and_counts_rebalances():
+    # given
+    events = list(generate_trace(2000, groups=2, seed=1))
+
+    # when
+    eager = simulate(events, {"rebalancing_length": 7}, window=1000)
+    lazy = simulate(events, {"rebalancing_length": 64}, window=1000)
+
+    # then
+    assert eager["events"] == lazy["events"] == 2000
+    assert [point["events"] for point in eager["timeline"]] == [1000, 2000]
+    assert eager["rebalances"] > lazy["rebalances"]
+    assert eager["rebalanced_objects"] >= eager["max_rebalance_size"] > 0
+
+
+def test_simulation_supports_custom_alphabet():
+    # given
+    base_symbols = "0123456789abcdefghijklmnopqrstuvwxyz"
+    simulation = Simulation(make_lexorank(base_symbols=base_symbols))
+
+    # when
+    for event in generate_trace(500, groups=2, seed=2):
+        simulation.apply(event)
+
+    # then
+    assert simulation.lexorank.base == 36
+    for entries in simulation.groups.values():
+        ranks = [rank for rank, _ in entries]
+        assert ranks == sorted(ranks)
+        assert all(set(rank) <= set(base_symbols) for rank in ranks)
+
+
+@pytest.mark.parametrize("base_symbols", ["zyx", "abca"])
+def test_simulation_rejects_unsorted_alphabet(base_symbols):
+    with pytest.raises(ValueError):
+        make_lexorank(base_symbols=base_symbols)
+
+
+def test_simulation_replays_trace_file(tmp_path, capsys):
+    # given
+    trace = tmp_path / "trace.jsonl"
+    events = [
+        {"op": "insert", "group": "a", "id": 1},
+        {"op": "insert", "group": "a", "id": 2, "top": True},
+        {"op": "insert", "group": "b", "id": 3},
+        {"op": "move", "id": 1, "group": "b", "before": "3"},
+        {"op": "delete", "id": 2},
+    ]
+    trace.write_text("\n".join(json.dumps(event) for event in events) + "\n")
+
+    # when
+    results = main([str(trace), "--json"])
+
+    # then
+    assert results[0]["events"] == 5
+    assert results[0]["rank_lengths"]["objects"] == 2
+    assert json.loads(capsys.readouterr().out) == results
+
+
+def test_simulation_raises_when_rebalancing_does_not_make_space():
+    # given
+    lexorank = make_lexorank(
+        base_symbols="ab", default_rank_length=2, max_rank_length=3
+    )
+    simulation = Simulation(lexorank)
+
+    # then
+    with pytest.raises(ValueError):
+        for i in range(20):
+            simulation.place(str(i), "group", {"top": True})
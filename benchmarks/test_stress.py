@@ -0,0 +1,45 @@
+from benchmarks.stress import OPERATIONS, parse_mix, run_stress, seed_data
+
+
+def test_stress_harness_reports_operations_and_rank_health():
+    # given
+    board_ids = seed_data(groups=2, objects_count=20)
+    mix = parse_mix(",".join(OPERATIONS))
+
+    # when
+    report = run_stress(mix=mix, board_ids=board_ids, max_operations=50, seed=1)
+
+    # then
+    assert report["operations"] + report["errors"] + report["lock_errors"] == 50
+    assert set(report["per_operation"]) <= set(OPERATIONS)
+    assert report["duplicate_ranks"] == 0
+    assert report["max_rank_length"] >= 6
+
+
+def test_stress_harness_times_write_statements_and_repeats_seeded_runs():
+    # given
+    mix = parse_mix(",".join(OPERATIONS))
+
+    # when
+    reports = [
+        run_stress(
+            mix=mix,
+            board_ids=seed_data(groups=2, objects_count=20),
+            max_operations=30,
+            seed=2,
+        )
+        for _ in range(2)
+    ]
+
+    # then
+    counts = [
+        {
+            operation: stats["count"]
+            for operation, stats in report["per_operation"].items()
+        }
+        for report in reports
+    ]
+    assert reports[0]["write_s"] > 0
+    assert reports[0]["lock_error_s"] == 0
+    assert counts[0] == counts[1]
+    assert reports[0]["max_rank_length"] == reports[1]["max_rank_length"]
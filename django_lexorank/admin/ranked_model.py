@@ -1,18 +1,160 @@
-from django.contrib import admin
+import json
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.paginator import Paginator
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.http import urlencode
 
 
 class RankedModelAdmin(admin.ModelAdmin):
     actions = ["rebalance_ranks"]
+    change_list_template = "admin/django_lexorank/change_list.html"
+    reorder_template = "admin/django_lexorank/reorder.html"
+    # Counting all objects of large lists on every changelist page is slow.
+    show_full_result_count = False
+    reorder_page_size = 100
+    reorder_max_moves = 1000
+
+    @admin.action(description="Schedule rebalancing of ranks")
+    def rebalance_ranks(self, request, queryset):
+        """
+        Schedule rebalancing of groups of selected objects, to be processed
+        by `rebalance_ranks --scheduled` management command.
+        """
+        model = queryset.model
+        attnames = model._get_with_respect_to_attnames()
+
+        if attnames:
+            groups = (
+                queryset.order_by()
+                .values_list(*attnames, flat=len(attnames) == 1)
+                .distinct()
+            )
+        else:
+            groups = [""] if queryset.exists() else []
+
+        scheduled = model.schedule_groups_rebalancing(groups)
+        self.message_user(
+            request,
+            f"Rebalancing of {scheduled} group(s) scheduled.",
+            messages.SUCCESS,
+        )
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                "reorder/",
+                self.admin_site.admin_view(self.reorder_view),
+                name="%s_%s_reorder" % info,
+            ),
+            *super().get_urls(),
+        ]
+
+    def get_reorder_group_kwargs(self, request) -> dict:
+        """
+        Return `with_respect_to_kwargs` of the group from query parameters,
+        converted with `to_python()` of the fields. An empty value of a nullable
+        field stands for NULL. Raise `ValidationError` on invalid values.
+        """
+        kwargs = {}
+        for name, attname in zip(
+            self.model._get_with_respect_to_fields(),
+            self.model._get_with_respect_to_attnames(),
+        ):
+            if attname not in request.GET:
+                continue
+
+            field = self.model._meta.get_field(name)
+            value = request.GET[attname]
+            kwargs[attname] = (
+                None if value == "" and field.null else field.to_python(value)
+            )
 
-    @admin.action(description="Rebalance ranks")
-    def rebalance_ranks(modeladmin, request, queryset):
-        model = queryset.first().model
+        return kwargs
 
-        if model.order_with_respect_to:
-            queryset = queryset.distinct(model.order_with_respect_to)
+    @staticmethod
+    def get_reorder_group_query(with_respect_to_kwargs: dict) -> str:
+        """Return query string of a group, with NULL values as empty strings."""
+        return urlencode(
+            {
+                attname: "" if value is None else value
+                for attname, value in with_respect_to_kwargs.items()
+            }
+        )
 
-            for obj in queryset:
-                obj.rebalance()
+    def reorder_view(self, request):
+        """
+        Show a page of a group in rank order for drag-and-drop reordering,
+        or apply a JSON batch of moves `{"moves": [{"pk": 1, "after": 2}, ...]}`
+        posted by it with a single call of `apply_moves()`.
+        """
+        if not self.has_change_permission(request):
+            raise PermissionDenied
 
+        if request.method == "POST":
+            return self.reorder_moves(request)
+
+        attnames = self.model._get_with_respect_to_attnames()
+        try:
+            with_respect_to_kwargs = self.get_reorder_group_kwargs(request)
+        except ValidationError as error:
+            return HttpResponseBadRequest(" ".join(error.messages))
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.opts,
+            "title": f"Reorder {self.opts.verbose_name_plural}",
+            "groups": None,
+            "page": None,
+        }
+
+        if len(with_respect_to_kwargs) < len(attnames):
+            groups = (
+                self.model.get_ranked_queryset()
+                .order_by(*attnames)
+                .values_list(*attnames)
+                .distinct()
+            )
+            paginator = Paginator(groups, self.reorder_page_size)
+            context["page"] = paginator.get_page(request.GET.get("page"))
+            context["groups"] = [
+                self.get_reorder_group_query(self.model.get_group_kwargs(group))
+                for group in context["page"]
+            ]
+            context["group_query"] = ""
         else:
-            queryset.first().rebalance()
+            queryset = self.model._get_group_queryset(with_respect_to_kwargs)
+            paginator = Paginator(queryset.order_by("rank"), self.reorder_page_size)
+            context["page"] = paginator.get_page(request.GET.get("page"))
+            context["group_query"] = self.get_reorder_group_query(
+                with_respect_to_kwargs
+            )
+
+        return TemplateResponse(request, self.reorder_template, context)
+
+    def reorder_moves(self, request) -> JsonResponse:
+        try:
+            moves = json.loads(request.body)["moves"]
+        except (ValueError, KeyError, TypeError):
+            moves = None
+        if not isinstance(moves, list):
+            return JsonResponse({"error": "Invalid moves."}, status=400)
+
+        if len(moves) > self.reorder_max_moves:
+            return JsonResponse(
+                {"error": f"At most {self.reorder_max_moves} moves are allowed."},
+                status=400,
+            )
+
+        try:
+            moved = self.model.objects.apply_moves(moves)
+        except ValidationError as error:
+            return JsonResponse({"error": " ".join(error.messages)}, status=400)
+        except (ValueError, KeyError, TypeError, self.model.DoesNotExist) as error:
+            return JsonResponse({"error": str(error)}, status=400)
+
+        return JsonResponse({"moved": len(moved)})
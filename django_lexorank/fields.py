@@ -1,57 +1,141 @@
+from typing import Optional
+
 from django.db import models
+from django.db.models.signals import class_prepared
 
-from .lexorank import LexoRank
+from .instrumentation import instrument
+from .lexorank import LexoRank, Rank
 
 
 class RankField(models.CharField):
     def __init__(self, *args, **kwargs):
         kwargs.setdefault("max_length", 255)
         kwargs.setdefault("insert_to_bottom", False)
+        kwargs.setdefault("bucketed", False)
+        kwargs.setdefault("as_rank", False)
+        kwargs.setdefault("jitter_digits", None)
         kwargs.setdefault("db_index", True)
         kwargs.setdefault("editable", False)
 
         self.insert_to_bottom = kwargs.pop("insert_to_bottom")
+        self.bucketed = kwargs.pop("bucketed")
+        self.as_rank = kwargs.pop("as_rank")
+        self.jitter_digits = kwargs.pop("jitter_digits")
         super().__init__(*args, **kwargs)
 
+    def contribute_to_class(self, cls, name, private_only=False):
+        super().contribute_to_class(cls, name, private_only=private_only)
+
+        if (
+            self.db_index
+            and not cls._meta.abstract
+            and getattr(cls, "order_with_respect_to", None)
+        ):
+            # Index is added once all fields of the model are available.
+            class_prepared.connect(self.add_group_index, sender=cls, weak=False)
+
+    def add_group_index(self, sender, **kwargs) -> None:
+        """
+        Add a composite index on `order_with_respect_to` fields and the rank,
+        limited to objects matching `ranking_scope` if it is set.
+        """
+        fields = [*sender._get_with_respect_to_fields(), self.name]
+        if any(list(index.fields) == fields for index in sender._meta.indexes):
+            return
+
+        index = models.Index(fields=fields)
+        index.set_name_with_model(sender)
+        if sender.ranking_scope is not None:
+            # Partial indexes must be named explicitly.
+            index = models.Index(
+                fields=fields, name=index.name, condition=sender.ranking_scope
+            )
+        sender._meta.indexes.append(index)
+
+    def get_rank_in_between(
+        self, previous_rank: Optional[str], next_rank: Optional[str], objects_count: int
+    ) -> str:
+        """
+        Return a rank between provided ones: the middle of the gap, or a random
+        rank from its central half if `jitter_digits` is set.
+        """
+        if self.jitter_digits is None:
+            return LexoRank.get_lexorank_in_between(
+                previous_rank=previous_rank,
+                next_rank=next_rank,
+                objects_count=objects_count,
+            )
+
+        return LexoRank.get_random_lexorank_in_between(
+            previous_rank=previous_rank,
+            next_rank=next_rank,
+            objects_count=objects_count,
+            entropy_digits=self.jitter_digits,
+        )
+
+    def with_bucket(self, rank: str) -> str:
+        """
+        Prefix the rank with the default bucket if the field is bucketed.
+        Used for the first object of a group only: other ranks take the bucket
+        of their neighbours, so groups with legacy ranks keep their order.
+        """
+        if not self.bucketed or not rank:
+            return rank
+
+        bucket, rank = LexoRank.split_bucket(rank)
+        return LexoRank.join_bucket(bucket or LexoRank.default_bucket, rank)
+
+    def get_db_converters(self, connection):
+        # Added only when enabled, so loading plain string ranks costs nothing.
+        converters = super().get_db_converters(connection)
+        if self.as_rank:
+            converters.append(self.rank_from_db_value)
+        return converters
+
+    def rank_from_db_value(self, value, expression, connection) -> Optional[Rank]:
+        return Rank(value) if value else value
+
     def pre_save(self, model_instance, add):
         current_rank = super().pre_save(model_instance, add)
 
         if not current_rank:
-            model = model_instance._meta.model
-
-            if model.order_with_respect_to:
-                with_respect_to_kwargs = {
-                    model.order_with_respect_to: getattr(
-                        model_instance, model.order_with_respect_to
-                    )
-                }
-            else:
-                with_respect_to_kwargs = {}
-
-            if self.insert_to_bottom:
-                previous_rank = model.get_last_object_rank(
-                    with_respect_to_kwargs=with_respect_to_kwargs
-                )
-                kwargs = {
-                    "previous_rank": previous_rank,
-                    "next_rank": None,
-                }
-            else:
-                next_rank = model.get_first_object_rank(
-                    with_respect_to_kwargs=with_respect_to_kwargs
-                )
-                kwargs = {
-                    "previous_rank": None,
-                    "next_rank": next_rank,
-                }
-
-            objects_count = model.objects.count()
-
-            current_rank = LexoRank.get_lexorank_in_between(
-                objects_count=objects_count,
-                **kwargs,
-            )
+            with instrument("pre_save", model_instance) as stats:
+                current_rank = self.get_new_rank(model_instance)
+                stats["rank_length"] = LexoRank.get_length(current_rank)
 
-            model_instance.rank = current_rank
+            setattr(model_instance, self.attname, current_rank)
 
         return current_rank
+
+    def get_new_rank(self, model_instance) -> str:
+        """Return a rank for placing the instance at the top or bottom of its list."""
+        model = model_instance._meta.model
+        with_respect_to_kwargs = model_instance._with_respect_to_kwargs
+
+        if self.insert_to_bottom:
+            previous_rank = model.get_last_object_rank(
+                with_respect_to_kwargs=with_respect_to_kwargs
+            )
+            kwargs = {
+                "previous_rank": previous_rank,
+                "next_rank": None,
+            }
+        else:
+            next_rank = model.get_first_object_rank(
+                with_respect_to_kwargs=with_respect_to_kwargs
+            )
+            kwargs = {
+                "previous_rank": None,
+                "next_rank": next_rank,
+            }
+
+        objects_count = model._get_group_queryset(with_respect_to_kwargs).count()
+
+        rank = self.get_rank_in_between(
+            objects_count=objects_count,
+            **kwargs,
+        )
+        if kwargs["previous_rank"] or kwargs["next_rank"]:
+            return rank
+
+        return self.with_bucket(rank)
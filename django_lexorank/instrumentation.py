@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.db import connections, router
+
+from .lexorank import LexoRank
+from .signals import ranking_operation
+
+logger = logging.getLogger("django_lexorank")
+
+_local = threading.local()
+
+
+@contextmanager
+def instrument(operation: str, instance):
+    """
+    Measure duration and query count of a ranking operation and send
+    `ranking_operation` signal when it completes.
+    Does nothing if the signal has no receivers.
+    """
+    model = instance._meta.model
+    stats = {"rank_length": None, "rebalancing_scheduled": False}
+
+    if not ranking_operation.has_listeners(model):
+        yield stats
+        return
+
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    connection = connections[router.db_for_write(model, instance=instance)]
+    operations = _local.__dict__.setdefault("operations", [])
+    operations.append(stats)
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(count_queries):
+            yield stats
+    finally:
+        operations.pop()
+
+    ranking_operation.send(
+        sender=model,
+        operation=operation,
+        instance=instance,
+        group=instance._with_respect_to_value,
+        queries=queries,
+        duration=time.perf_counter() - start,
+        rank_length=stats["rank_length"],
+        rebalancing_scheduled=stats["rebalancing_scheduled"],
+    )
+
+
+def instrumented(operation: str):
+    """Decorator that instruments a `RankedModel` method."""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with instrument(operation, self) as stats:
+                result = method(self, *args, **kwargs)
+                stats["rank_length"] = (
+                    LexoRank.get_length(self.rank) if self.rank else None
+                )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def mark_rebalancing_scheduled() -> None:
+    """Mark all operations in progress as having scheduled rebalancing."""
+    for stats in getattr(_local, "operations", []):
+        stats["rebalancing_scheduled"] = True
+
+
+def log_ranking_operation(
+    sender,
+    operation,
+    group,
+    queries,
+    duration,
+    rank_length,
+    rebalancing_scheduled,
+    **kwargs,
+):
+    """`ranking_operation` receiver that logs operations to `django_lexorank`."""
+    logger.info(
+        "%s.%s group=%s queries=%d duration=%.3fms rank_length=%s "
+        "rebalancing_scheduled=%s",
+        sender._meta.label,
+        operation,
+        group,
+        queries,
+        duration * 1000,
+        rank_length,
+        rebalancing_scheduled,
+    )
+
+
+class StatsdReceiver:
+    """
+    `ranking_operation` receiver that reports operations to a statsd-style
+    client exposing `timing()`, `gauge()` and `incr()` methods.
+    """
+
+    def __init__(self, client, prefix: str = "lexorank"):
+        self.client = client
+        self.prefix = prefix
+
+    def __call__(
+        self,
+        sender,
+        operation,
+        queries,
+        duration,
+        rank_length,
+        rebalancing_scheduled,
+        **kwargs,
+    ):
+        name = f"{self.prefix}.{sender._meta.label_lower}.{operation}"
+
+        self.client.timing(f"{name}.duration", duration * 1000)
+        self.client.gauge(f"{name}.queries", queries)
+        if rank_length is not None:
+            self.client.gauge(f"{name}.rank_length", rank_length)
+        if rebalancing_scheduled:
+            self.client.incr(f"{name}.rebalancing_scheduled")
@@ -1,6 +1,22 @@
 import math
+import random
 import string
-from typing import List, Optional, Tuple
+from functools import total_ordering
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Digits `int()` understands for bases up to 36.
+INT_DIGITS = string.digits + string.ascii_lowercase
+
+# Lookup tables per alphabet, built on first use.
+_symbol_tables: Dict[str, tuple] = {}
+
+# Seeded by the OS, so processes never pick the same random ranks.
+_random = random.SystemRandom()
 
 
 class LexoRank:
@@ -11,22 +27,110 @@ class LexoRank:
     first_symbol = base_symbols[0]
     last_symbol = base_symbols[-1]
     base = len(base_symbols)
+    compact_rank_gap = 25
+    buckets = "012"
+    default_bucket = buckets[0]
+    bucket_separator = "|"
+
+    @classmethod
+    def get_symbol_tables(cls) -> tuple:
+        """
+        Return lookup tables for the current alphabet: symbol values, symbols,
+        all two-symbol strings by value and a `str.translate` table to `int()`
+        digits (or `None` if the alphabet is too long for `int()`).
+        """
+        tables = _symbol_tables.get(cls.base_symbols)
+        if tables is None:
+            symbols = tuple(cls.base_symbols)
+            values = {symbol: value for value, symbol in enumerate(symbols)}
+            pairs = tuple(first + second for first in symbols for second in symbols)
+            int_digits_table = (
+                str.maketrans(cls.base_symbols, INT_DIGITS[: cls.base])
+                if cls.base <= len(INT_DIGITS)
+                else None
+            )
+            tables = _symbol_tables[cls.base_symbols] = (
+                values,
+                symbols,
+                pairs,
+                int_digits_table,
+            )
+        return tables
 
     @classmethod
     def char_to_int(cls, char: str) -> int:
-        return ord(char) - ord(cls.first_symbol)
+        return cls.get_symbol_tables()[0][char]
 
     @classmethod
     def int_to_char(cls, num: int) -> str:
-        return chr(num + ord(cls.first_symbol))
+        return cls.get_symbol_tables()[1][num]
 
     @classmethod
     def parse_rank(cls, rank: str) -> List[int]:
-        return [cls.char_to_int(char) for char in rank]
+        values = cls.get_symbol_tables()[0]
+        return [values[char] for char in rank]
 
     @classmethod
     def format_rank(cls, rank: List[int]) -> str:
-        return "".join(map(cls.int_to_char, rank))
+        symbols = cls.get_symbol_tables()[1]
+        return "".join([symbols[rank_part] for rank_part in rank])
+
+    @classmethod
+    def split_bucket(cls, rank: Union[str, "Rank"]) -> Tuple[Optional[str], str]:
+        """Split a rank like `0|hzzzzz` into its bucket and the rank within it."""
+        bucket, separator, rank = str(rank).rpartition(cls.bucket_separator)
+        return (bucket if separator else None), rank
+
+    @classmethod
+    def get_length(cls, rank: Union[str, "Rank"]) -> int:
+        """Return length of the rank without its bucket prefix."""
+        return len(cls.split_bucket(rank)[1])
+
+    @classmethod
+    def join_bucket(cls, bucket: Optional[str], rank: str) -> str:
+        if bucket is None:
+            return rank
+        return f"{bucket}{cls.bucket_separator}{rank}"
+
+    @classmethod
+    def get_next_bucket(cls, bucket: Optional[str]) -> str:
+        if bucket is None:
+            return cls.default_bucket
+        return cls.buckets[(cls.buckets.index(bucket) + 1) % len(cls.buckets)]
+
+    @classmethod
+    def split_neighbour_buckets(
+        cls, previous_rank: Optional[str], next_rank: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Return the bucket for a rank placed between provided ranks and the
+        neighbour ranks within that bucket. Between ranks of different buckets,
+        which happens while a group is moved to the next bucket, the rank is
+        placed into the bucket being moved from, next to its outermost rank.
+        Legacy ranks without a bucket are the bucket being moved from.
+        """
+        previous_bucket, next_bucket = None, None
+        if previous_rank:
+            previous_bucket, previous_rank = cls.split_bucket(previous_rank)
+        if next_rank:
+            next_bucket, next_rank = cls.split_bucket(next_rank)
+
+        if not previous_rank or not next_rank:
+            return previous_bucket or next_bucket, previous_rank, next_rank
+
+        if previous_bucket == next_bucket:
+            return previous_bucket, previous_rank, next_rank
+
+        if previous_bucket is None:
+            return None, previous_rank, None
+
+        if next_bucket is None:
+            return None, None, next_rank
+
+        if cls.get_next_bucket(previous_bucket) == next_bucket:
+            return previous_bucket, previous_rank, None
+
+        return next_bucket, None, next_rank
 
     @classmethod
     def align_ranks(cls, previous_rank: str, next_rank: str) -> Tuple[str, str]:
@@ -35,8 +139,9 @@ class LexoRank:
         if max_len > cls.max_rank_length:
             raise ValueError("Rebalancing Required")
 
+        # Padding with the first symbol keeps ranks ordered: "c" < "ca" < "cb".
         previous_rank = previous_rank.ljust(max_len, cls.first_symbol)
-        next_rank = next_rank.ljust(max_len, cls.last_symbol)
+        next_rank = next_rank.ljust(max_len, cls.first_symbol)
 
         return previous_rank, next_rank
 
@@ -48,6 +153,10 @@ class LexoRank:
         objects_count: int,
         force_reorder: bool = False,
     ) -> str:
+        bucket, previous_rank, next_rank = cls.split_neighbour_buckets(
+            previous_rank, next_rank
+        )
+
         if not previous_rank:
             previous_rank = cls.get_min_rank(objects_count=objects_count)
 
@@ -84,7 +193,7 @@ class LexoRank:
             middle_rank_part = previous_rank_part + to_add + offset
             offset = 0
 
-            if middle_rank_part > cls.base:
+            if middle_rank_part >= cls.base:
                 offset = 1
                 middle_rank_part -= cls.base
 
@@ -99,7 +208,170 @@ class LexoRank:
                 // 2
             )
 
-        return cls.format_rank(middle_rank_parts)
+        return cls.join_bucket(bucket, cls.format_rank(middle_rank_parts))
+
+    @classmethod
+    def get_random_lexorank_in_between(
+        cls,
+        previous_rank: Optional[str],
+        next_rank: Optional[str],
+        objects_count: int,
+        entropy_digits: int = 2,
+    ) -> str:
+        """
+        Return a uniformly random rank from the central half of the gap between
+        provided ranks. The rank is extended until the central half holds at least
+        `base ** entropy_digits` ranks, so ranks picked concurrently between
+        the same neighbours almost never collide.
+        """
+        bucket, previous_rank, next_rank = cls.split_neighbour_buckets(
+            previous_rank, next_rank
+        )
+
+        if not previous_rank:
+            previous_rank = cls.get_min_rank(objects_count=objects_count)
+
+        if not next_rank:
+            next_rank = cls.get_max_rank(objects_count=objects_count)
+
+        previous_rank, next_rank = cls.align_ranks(previous_rank, next_rank)
+
+        if not previous_rank < next_rank:
+            raise ValueError("Previous rank must go before than next rank.")
+
+        rank_length = len(previous_rank)
+        previous_value = cls.rank_to_int(previous_rank)
+        next_value = cls.rank_to_int(next_rank)
+
+        while (next_value - previous_value) // 2 < cls.base**entropy_digits:
+            rank_length += 1
+            if rank_length > cls.max_rank_length:
+                raise ValueError("Rebalancing Required")
+
+            previous_value *= cls.base
+            next_value *= cls.base
+
+        quarter = (next_value - previous_value) // 4
+        value = _random.randint(previous_value + quarter, next_value - quarter)
+
+        return cls.join_bucket(bucket, cls.int_to_rank(value, rank_length))
+
+    @classmethod
+    def rank_to_int(cls, rank: str) -> int:
+        if not rank:
+            return 0
+
+        int_digits_table = cls.get_symbol_tables()[3]
+        if int_digits_table is not None:
+            return int(rank.translate(int_digits_table), cls.base)
+
+        value = 0
+        for rank_part in cls.parse_rank(rank):
+            value = value * cls.base + rank_part
+        return value
+
+    @classmethod
+    def int_to_rank(cls, value: int, rank_length: int) -> str:
+        """
+        Format the lowest `rank_length` digits of the value,
+        two symbols per lookup.
+        """
+        _, symbols, pairs, _ = cls.get_symbol_tables()
+        pair_base = cls.base**2
+
+        chunks = []
+        for _ in range(rank_length // 2):
+            value, pair = divmod(value, pair_base)
+            chunks.append(pairs[pair])
+        if rank_length % 2:
+            chunks.append(symbols[value % cls.base])
+
+        return "".join(reversed(chunks))
+
+    @classmethod
+    def get_lexoranks_in_between(
+        cls,
+        previous_rank: Optional[str],
+        next_rank: Optional[str],
+        count: int,
+        objects_count: int,
+    ) -> List[str]:
+        """
+        Return `count` evenly spaced ranks between provided ranks, extending
+        the rank length only as much as required to fit all of them.
+        """
+        bucket, previous_rank, next_rank = cls.split_neighbour_buckets(
+            previous_rank, next_rank
+        )
+
+        if not previous_rank:
+            previous_rank = cls.get_min_rank(objects_count=objects_count)
+
+        if not next_rank:
+            next_rank = cls.get_max_rank(objects_count=objects_count)
+
+        previous_rank, next_rank = cls.align_ranks(previous_rank, next_rank)
+
+        if not previous_rank < next_rank:
+            raise ValueError("Previous rank must go before than next rank.")
+
+        rank_length = len(previous_rank)
+        previous_value = cls.rank_to_int(previous_rank)
+        next_value = cls.rank_to_int(next_rank)
+
+        # Leave at least one free rank between neighbours.
+        while (next_value - previous_value) // (count + 1) < 2:
+            rank_length += 1
+            if rank_length > cls.max_rank_length:
+                raise ValueError("Rebalancing Required")
+
+            previous_value *= cls.base
+            next_value *= cls.base
+
+        step = (next_value - previous_value) // (count + 1)
+
+        return [
+            cls.join_bucket(
+                bucket, cls.int_to_rank(previous_value + step * i, rank_length)
+            )
+            for i in range(1, count + 1)
+        ]
+
+    @classmethod
+    def get_compact_rank_length(
+        cls, objects_count: int, gap: Optional[int] = None
+    ) -> int:
+        """
+        Return the shortest rank length that fits `objects_count` ranks with
+        at least `gap` free ranks between neighbours and at both ends.
+        """
+        if gap is None:
+            gap = cls.compact_rank_gap
+
+        required_ranks = (objects_count + 1) * (gap + 1)
+        rank_length = 1
+        while cls.base**rank_length < required_ranks:
+            rank_length += 1
+
+        if rank_length > cls.max_rank_length:
+            raise ValueError("Too many objects to place.")
+
+        return rank_length
+
+    @classmethod
+    def get_compact_ranks(
+        cls, objects_count: int, gap: Optional[int] = None
+    ) -> List[str]:
+        """
+        Return `objects_count` evenly spaced ranks of the shortest length
+        leaving at least `gap` free ranks between neighbours and at both ends.
+        """
+        rank_length = cls.get_compact_rank_length(objects_count, gap=gap)
+        step = cls.base**rank_length // (objects_count + 1)
+
+        return [
+            cls.int_to_rank(step * i, rank_length) for i in range(1, objects_count + 1)
+        ]
 
     @classmethod
     def get_min_rank(cls, objects_count: int) -> str:
@@ -132,17 +404,168 @@ class LexoRank:
     @classmethod
     def increment_rank(cls, rank: str, objects_count: int) -> str:
         step = cls.get_rank_step(objects_count=objects_count)
-        rank_parts = LexoRank.parse_rank(rank)
+        value = cls.rank_to_int(rank) + step
+        rank_length = len(rank)
+        while value >= cls.base**rank_length:
+            rank_length += 1
+        return cls.int_to_rank(value, rank_length)
+
+    @classmethod
+    def iter_ranks(cls, objects_count: int) -> Iterator[str]:
+        """Yield evenly spaced ranks for all objects, as assigned by rebalancing."""
+        if not objects_count:
+            return
+
+        rank_length = cls.get_rank_length(objects_count=objects_count)
+        step = cls.get_rank_step(objects_count=objects_count)
+        for value in range(step, step * objects_count + 1, step):
+            yield cls.int_to_rank(value, rank_length)
 
-        for i in range(len(rank_parts) - 1, -1, -1):
-            if step == 0:
-                break
+    @classmethod
+    def get_rank_sequence_buffer(cls, objects_count: int) -> bytes:
+        """
+        Return ranks yielded by `iter_ranks()` concatenated into a single ASCII
+        buffer of fixed width ranks. With NumPy installed, all ranks are computed
+        at once by decomposing their values into digits, two symbols per lookup.
+        """
+        rank_length = cls.get_rank_length(objects_count=objects_count)
+        if (
+            not objects_count
+            or numpy is None
+            or not cls.base_symbols.isascii()
+            or cls.base**rank_length > numpy.iinfo(numpy.int64).max
+        ):
+            return "".join(cls.iter_ranks(objects_count=objects_count)).encode()
+
+        _, _, pairs, _ = cls.get_symbol_tables()
+        symbols_table = numpy.frombuffer(cls.base_symbols.encode(), dtype=numpy.uint8)
+        pairs_table = numpy.frombuffer("".join(pairs).encode(), dtype=numpy.uint16)
+
+        step = cls.get_rank_step(objects_count=objects_count)
+        values = numpy.arange(1, objects_count + 1, dtype=numpy.int64) * step
+
+        buffer = numpy.empty((objects_count, rank_length), dtype=numpy.uint8)
+        # With an odd length, the first symbol is looked up separately.
+        first_pair_column = rank_length % 2
+        pair_columns = buffer[:, first_pair_column:].view(numpy.uint16)
+        for column in reversed(range(rank_length // 2)):
+            values, pair_values = numpy.divmod(values, cls.base**2)
+            pair_columns[:, column] = pairs_table[pair_values]
+        if rank_length % 2:
+            buffer[:, 0] = symbols_table[values % cls.base]
+
+        return buffer.tobytes()
+
+    @classmethod
+    def get_rank_sequence(cls, objects_count: int) -> List[str]:
+        """Return ranks yielded by `iter_ranks()` as a list, built from one buffer."""
+        rank_length = cls.get_rank_length(objects_count=objects_count)
+        ranks = cls.get_rank_sequence_buffer(objects_count=objects_count).decode()
+        return [
+            ranks[start:end]
+            for start, end in zip(
+                range(0, len(ranks), rank_length),
+                range(rank_length, len(ranks) + 1, rank_length),
+            )
+        ]
 
-            total = rank_parts[i] + step
-            rank_parts[i] = total % cls.base
-            step = total // cls.base
 
-        if step > 0:
-            rank_parts = [step] + rank_parts
+@total_ordering
+class Rank:
+    """
+    Immutable rank value caching its integer value and length, so comparing
+    ranks, splitting gaps and stepping through ranks use integer arithmetic
+    instead of lists of digits. Compares and hashes like its string.
+    """
+
+    __slots__ = ("bucket", "value", "length", "_string")
+
+    def __init__(self, rank: Union[str, "Rank"]) -> None:
+        bucket, rank = LexoRank.split_bucket(rank)
+        self._set(bucket, LexoRank.rank_to_int(rank), len(rank))
+
+    @classmethod
+    def from_int(cls, value: int, length: int, bucket: Optional[str] = None) -> "Rank":
+        rank = cls.__new__(cls)
+        rank._set(bucket, value, length)
+        return rank
+
+    def _set(self, bucket: Optional[str], value: int, length: int) -> None:
+        object.__setattr__(self, "bucket", bucket)
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "length", length)
+        object.__setattr__(self, "_string", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Rank is immutable.")
+
+    def __str__(self) -> str:
+        if self._string is None:
+            string = LexoRank.join_bucket(
+                self.bucket, LexoRank.int_to_rank(self.value, self.length)
+            )
+            object.__setattr__(self, "_string", string)
+        return self._string
+
+    def __repr__(self) -> str:
+        return f"Rank({str(self)!r})"
+
+    def __len__(self) -> int:
+        return len(str(self))
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def _aligned(self, other: "Rank") -> Tuple[int, int]:
+        length = max(self.length, other.length)
+        return (
+            self.value * LexoRank.base ** (length - self.length),
+            other.value * LexoRank.base ** (length - other.length),
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, str):
+            return str(self) == other
+        if not isinstance(other, Rank):
+            return NotImplemented
+        return (self.bucket, self.value, self.length) == (
+            other.bucket,
+            other.value,
+            other.length,
+        )
 
-        return LexoRank.format_rank(rank_parts)
+    def __lt__(self, other) -> bool:
+        if isinstance(other, str):
+            other = Rank(other)
+        if not isinstance(other, Rank):
+            return NotImplemented
+        if self.bucket != other.bucket:
+            return str(self) < str(other)
+
+        # Shorter ranks go first among ranks equal after padding: "c" < "ca".
+        value, other_value = self._aligned(other)
+        return (value, self.length) < (other_value, other.length)
+
+    def __add__(self, step: int) -> "Rank":
+        value = self.value + step
+        length = self.length
+        while value >= LexoRank.base**length:
+            length += 1
+        return Rank.from_int(value, length, self.bucket)
+
+    def midpoint(self, other: "Rank") -> "Rank":
+        """
+        Return the rank halfway between this and other rank of the same bucket,
+        extending the length by one symbol if there is no free rank between them.
+        """
+        if self.bucket != other.bucket:
+            raise ValueError("Ranks must belong to the same bucket.")
+
+        previous_value, next_value = sorted(self._aligned(other))
+        length = max(self.length, other.length)
+        if next_value - previous_value < 2:
+            previous_value *= LexoRank.base
+            next_value *= LexoRank.base
+            length += 1
+
+        return Rank.from_int((previous_value + next_value) // 2, length, self.bucket)
@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from ..models import RankedModel
+
+
+class RankedModelsCommand(BaseCommand):
+    """Base class for commands that accept a list of ranked models."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.ModelName",
+            help="Ranked models to process. Defaults to all ranked models.",
+        )
+
+    def get_models(self, labels):
+        if not labels:
+            return [
+                model for model in apps.get_models() if issubclass(model, RankedModel)
+            ]
+
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+
+            if not issubclass(model, RankedModel):
+                raise CommandError(f"{label} is not a ranked model.")
+
+            models.append(model)
+
+        return models
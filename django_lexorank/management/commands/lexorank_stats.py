@@ -0,0 +1,56 @@
+import json
+
+from ...lexorank import LexoRank
+from ..base import RankedModelsCommand
+
+
+class Command(RankedModelsCommand):
+    help = (
+        "Show rank statistics of ranked models per group, "
+        "starting with the groups closest to the rebalancing length."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Number of groups to show per model, 0 for all groups.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Output statistics as JSON.",
+        )
+
+    def handle(self, *args, **options):
+        stats = {
+            model._meta.label: model.get_rank_stats(limit=options["limit"] or None)
+            for model in self.get_models(options["models"])
+        }
+
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "rebalancing_length": LexoRank.rebalancing_length,
+                        "models": stats,
+                    },
+                    default=str,
+                )
+            )
+            return
+
+        self.stdout.write(f"Rebalancing length: {LexoRank.rebalancing_length}")
+        for label, groups in stats.items():
+            self.stdout.write(f"{label}:")
+            for group in groups:
+                self.stdout.write(
+                    f"  group={group['group']!s:<12} "
+                    f"objects={group['objects_count']:<8} "
+                    f"max_length={group['max_rank_length']:<4} "
+                    f"avg_length={group['avg_rank_length']:<7.2f} "
+                    f"duplicates={group['duplicate_ranks']:<6} "
+                    f"rebalancing_required={group['rebalancing_required']}"
+                )
@@ -0,0 +1,53 @@
+from ..base import RankedModelsCommand
+
+
+class Command(RankedModelsCommand):
+    help = (
+        "Rebalance groups of ranked models that require rebalancing, "
+        "all groups with --all, or groups with scheduled rebalancing with --scheduled."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebalance all groups, not only the ones that require it.",
+        )
+        parser.add_argument(
+            "--scheduled",
+            action="store_true",
+            help="Rebalance groups with scheduled rebalancing and delete schedules.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of threads rebalancing groups concurrently.",
+        )
+        parser.add_argument(
+            "--in-database",
+            action="store_true",
+            help="Calculate ranks in the database instead of Python.",
+        )
+        parser.add_argument(
+            "--compact",
+            action="store_true",
+            help="Assign the shortest ranks fitting each group.",
+        )
+
+    def handle(self, *args, **options):
+        for model in self.get_models(options["models"]):
+            rebalance_options = {
+                "workers": options["workers"],
+                "in_database": options["in_database"],
+                "compact": options["compact"],
+            }
+
+            if options["scheduled"]:
+                rebalanced = model.rebalance_scheduled(**rebalance_options)
+            else:
+                groups = model.get_groups() if options["all"] else None
+                rebalanced = model.rebalance_all(groups=groups, **rebalance_options)
+
+            self.stdout.write(f"{model._meta.label}: {rebalanced} group(s) rebalanced.")
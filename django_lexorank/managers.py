@@ -1,41 +1,400 @@
-from django.db import models
+from typing import Iterable, List, Optional
 
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    Value,
+    When,
+    Window,
+)
+from django.db.models.functions import Lag, Lead
+
+from .instrumentation import instrument
 from .lexorank import LexoRank
+from .sql import update_ranks_in_database
 
 
 class RankedModelQuerySet(models.QuerySet):
-    pass
+    def with_neighbours(self, pks: bool = False) -> "RankedModelQuerySet":
+        """
+        Annotate objects with `previous_rank` and `next_rank` of their neighbours
+        in the list (and `previous_pk`, `next_pk` if `pks` is set) using
+        `LAG`/`LEAD` window functions. The neighbours are computed among
+        objects matched by the queryset, which should include whole groups.
+        """
+        partition_by = [
+            F(attname) for attname in self.model._get_with_respect_to_attnames()
+        ] or None
 
+        def neighbour(function, field):
+            return Window(
+                function(field), partition_by=partition_by, order_by=F("rank").asc()
+            )
 
-class RankedModelManager(models.Manager.from_queryset(RankedModelQuerySet)):  # type: ignore[misc] # noqa: E501
-    def _add(self, ordering: str, **kwargs):
-        if self.model.order_with_respect_to:
-            with_respect_to_kwargs = {
-                self.model.order_with_respect_to: kwargs[
-                    self.model.order_with_respect_to
-                ]
-            }
-        else:
-            with_respect_to_kwargs = {}
+        annotations = {
+            "previous_rank": neighbour(Lag, "rank"),
+            "next_rank": neighbour(Lead, "rank"),
+        }
+        if pks:
+            annotations["previous_pk"] = neighbour(Lag, "pk")
+            annotations["next_pk"] = neighbour(Lead, "pk")
 
-        qs = self.filter(**with_respect_to_kwargs).order_by(f"{ordering}rank")
+        return self.annotate(**annotations)
+
+    def rank_by(self, *fields: str) -> int:
+        """
+        Assign fresh evenly spaced ranks to objects ordered by provided fields
+        with a single UPDATE statement, keeping the current order for ties.
+        Whole groups matched by the queryset are ranked, so the result is
+        compatible with placing objects later. For models ranked globally,
+        the queryset must match all ranked objects.
+        Return the number of ranked objects.
+        """
+        if not self.exists():
+            return 0
+
+        queryset = self.model.get_ranked_queryset()
+        partition_by = self.model._get_with_respect_to_attnames()
+        if partition_by:
+            groups = self.order_by().filter(
+                **{attname: OuterRef(attname) for attname in partition_by}
+            )
+            queryset = queryset.filter(Exists(groups))
+        elif queryset.exclude(pk__in=self.values("pk")).exists():
+            raise ValueError(
+                "Queryset of a model ranked globally must match all ranked objects."
+            )
+
+        return update_ranks_in_database(
+            queryset, partition_by=partition_by, order_by=[*fields, "rank", "pk"]
+        )
 
-        objects_count = qs.count()
-        first_obj = qs.first()
 
+class RankedModelManager(models.Manager.from_queryset(RankedModelQuerySet)):  # type: ignore[misc] # noqa: E501
+    def _get_add_queryset(self, ordering: str, **kwargs) -> models.QuerySet:
+        # An unsaved instance resolves the group from field names, attnames
+        # and defaults of the fields alike.
+        with_respect_to_kwargs = self.model(**kwargs)._with_respect_to_kwargs
+
+        return self.model._get_group_queryset(with_respect_to_kwargs).order_by(
+            f"{ordering}rank"
+        )
+
+    def _get_add_rank(
+        self, ordering: str, first_obj: Optional[models.Model], objects_count: int
+    ) -> str:
         new_rank_field = "previous_rank" if ordering == "-" else "next_rank"
         existing_rank_field = "next_rank" if ordering == "-" else "previous_rank"
 
-        rank = LexoRank.get_lexorank_in_between(
+        rank_field = self.model._meta.get_field("rank")
+        rank = rank_field.get_rank_in_between(
             **{  # type: ignore[arg-type]
                 existing_rank_field: None,
                 new_rank_field: first_obj.rank if first_obj else None,
             },
             objects_count=objects_count,
         )
+        if first_obj:
+            return rank
+
+        return rank_field.with_bucket(rank)
+
+    def _add(self, ordering: str, **kwargs):
+        qs = self._get_add_queryset(ordering, **kwargs)
+
+        objects_count = qs.count()
+        first_obj = qs.first()
+
+        rank = self._get_add_rank(ordering, first_obj, objects_count)
 
         return self.create(rank=rank, **kwargs)
 
+    async def _aadd(self, ordering: str, **kwargs):
+        qs = self._get_add_queryset(ordering, **kwargs)
+
+        objects_count = await qs.acount()
+        first_obj = await qs.afirst()
+
+        rank = self._get_add_rank(ordering, first_obj, objects_count)
+
+        return await self.acreate(rank=rank, **kwargs)
+
+    def _get_ranks_in_gap(
+        self,
+        objs: List[models.Model],
+        with_respect_to_kwargs: dict,
+        previous_obj: Optional[models.Model],
+        next_obj: Optional[models.Model],
+    ) -> List[str]:
+        if previous_obj:
+            aggregates = {
+                "next_rank": Min("rank", filter=Q(rank__gt=previous_obj.rank))
+            }
+        else:
+            aggregates = {
+                "previous_rank": Max("rank", filter=Q(rank__lt=next_obj.rank))
+            }
+
+        stats = (
+            self.model._get_group_queryset(with_respect_to_kwargs)
+            .exclude(pk__in=[obj.pk for obj in objs])
+            .aggregate(objects_count=Count("pk"), **aggregates)
+        )
+
+        return LexoRank.get_lexoranks_in_between(
+            previous_rank=previous_obj.rank if previous_obj else stats["previous_rank"],
+            next_rank=next_obj.rank if next_obj else stats["next_rank"],
+            count=len(objs),
+            objects_count=stats["objects_count"] + len(objs),
+        )
+
+    def _place_many(
+        self,
+        objs: Iterable[models.Model],
+        previous_obj: Optional[models.Model] = None,
+        next_obj: Optional[models.Model] = None,
+    ) -> List[models.Model]:
+        target = previous_obj or next_obj
+        objs = sorted(
+            (obj for obj in objs if obj.pk != target.pk), key=lambda obj: obj.rank
+        )
+        if not objs:
+            return objs
+
+        with_respect_to_kwargs = target._with_respect_to_kwargs
+
+        ranks = self._get_ranks_in_gap(
+            objs, with_respect_to_kwargs, previous_obj, next_obj
+        )
+        if LexoRank.get_length(ranks[0]) >= LexoRank.rebalancing_length:
+            # The gap is too small, so rebalance the group and try again.
+            self.model.rebalance_group(with_respect_to_kwargs=with_respect_to_kwargs)
+            target.refresh_from_db(fields=["rank"])
+            ranks = self._get_ranks_in_gap(
+                objs, with_respect_to_kwargs, previous_obj, next_obj
+            )
+
+        fields = ["rank", *with_respect_to_kwargs]
+        for obj, rank in zip(objs, ranks):
+            obj.rank = rank
+            for attname, value in with_respect_to_kwargs.items():
+                setattr(obj, attname, value)
+
+        self.bulk_update(objs, fields)
+
+        for obj in objs:
+            obj._store_initial_values(fields=fields)
+            obj._clear_neighbours()
+
+        if target.rebalancing_required():
+            target.schedule_rebalancing()
+
+        return objs
+
+    def place_many_after(
+        self, objs: Iterable[models.Model], after_obj: models.Model
+    ) -> List[models.Model]:
+        """
+        Place objects after the provided one as a contiguous block, keeping their
+        relative order, with a single query for neighbours and a single update.
+        """
+        with transaction.atomic(), instrument("place_many_after", after_obj):
+            return self._place_many(objs, previous_obj=after_obj)
+
+    def place_many_before(
+        self, objs: Iterable[models.Model], before_obj: models.Model
+    ) -> List[models.Model]:
+        """
+        Place objects before the provided one as a contiguous block, keeping their
+        relative order, with a single query for neighbours and a single update.
+        """
+        with transaction.atomic(), instrument("place_many_before", before_obj):
+            return self._place_many(objs, next_obj=before_obj)
+
+    @staticmethod
+    def _get_closest_rank(
+        queryset: models.QuerySet, ranks: dict, pk, rank: str, following: bool
+    ) -> Optional[str]:
+        """
+        Return the closest rank following or preceding the provided one among
+        objects of the queryset and tracked `ranks` of other objects.
+        """
+        if following:
+            ranks = [
+                value for key, value in ranks.items() if key != pk and value > rank
+            ]
+            ranks.append(
+                queryset.filter(rank__gt=rank).aggregate(rank=Min("rank"))["rank"]
+            )
+            return min(filter(None, ranks), default=None)
+
+        ranks = [value for key, value in ranks.items() if key != pk and value < rank]
+        ranks.append(queryset.filter(rank__lt=rank).aggregate(rank=Max("rank"))["rank"])
+        return max(filter(None, ranks), default=None)
+
+    @transaction.atomic
+    def apply_moves(self, moves: Iterable[dict]) -> List[models.Model]:
+        """
+        Apply a batch of moves of objects of one group in order. Each move is
+        a dict with `pk` of the moved object and `after` or `before` with `pk`
+        of the object to place it next to. Uses one query per move to find
+        the neighbour rank and a single update for all moved objects.
+        Return the moved objects.
+        """
+        to_python = self.model._meta.pk.to_python
+        parsed_moves = []
+        for move in moves:
+            if ("after" in move) == ("before" in move):
+                raise ValueError("Each move must have either after or before.")
+
+            pk = to_python(move["pk"])
+            following = "after" in move
+            target_pk = to_python(move["after"] if following else move["before"])
+            if pk == target_pk:
+                raise ValueError("Object can not be moved next to itself.")
+            parsed_moves.append((pk, following, target_pk))
+
+        if not parsed_moves:
+            return []
+
+        pks = {pk for pk, _, _ in parsed_moves} | {pk for _, _, pk in parsed_moves}
+        objs = self.model.get_ranked_queryset().select_for_update().in_bulk(pks)
+        if len(objs) != len(pks):
+            raise self.model.DoesNotExist("Some of the moved objects do not exist.")
+
+        groups = {tuple(obj._with_respect_to_kwargs.items()) for obj in objs.values()}
+        if len(groups) > 1:
+            raise ValueError("Moved objects must belong to the same group.")
+
+        group_qs = self.model._get_group_queryset(dict(groups.pop()))
+        objects_count = group_qs.count()
+        rank_field = self.model._meta.get_field("rank")
+
+        # Ranks of loaded objects change while moves are applied, so they are
+        # tracked in memory and excluded from queries for neighbour ranks.
+        ranks = {pk: obj.rank for pk, obj in objs.items()}
+        other_objects = group_qs.exclude(pk__in=list(ranks))
+        moved = {}
+
+        for pk, following, target_pk in parsed_moves:
+            target_rank = ranks[target_pk]
+            closest_rank = self._get_closest_rank(
+                other_objects, ranks, pk, target_rank, following
+            )
+            ranks[pk] = rank_field.get_rank_in_between(
+                previous_rank=target_rank if following else closest_rank,
+                next_rank=closest_rank if following else target_rank,
+                objects_count=objects_count,
+            )
+            moved[pk] = objs[pk]
+
+        objs_to_update = list(moved.values())
+        for obj in objs_to_update:
+            obj.rank = ranks[obj.pk]
+
+        self.bulk_update(objs_to_update, ["rank"])
+
+        for obj in objs_to_update:
+            obj._store_initial_values(fields=["rank"])
+            obj._clear_neighbours()
+
+        if any(
+            LexoRank.get_length(obj.rank) >= LexoRank.rebalancing_length
+            for obj in objs_to_update
+        ):
+            objs_to_update[0].schedule_rebalancing()
+
+        return objs_to_update
+
+    def _get_group_kwargs(self, group) -> dict:
+        if not self.model.order_with_respect_to:
+            raise ValueError("order_with_respect_to must be set")
+
+        return self.model.get_group_kwargs(group)
+
+    @transaction.atomic
+    def clone_group(
+        self, source, destination, compact: bool = False, batch_size: int = 1000
+    ) -> List[models.Model]:
+        """
+        Copy objects of the source group within the ranking scope to the empty
+        destination group with `bulk_create`, keeping their ranks, or assigning
+        fresh evenly spaced ranks if `compact` is set. Copies get new primary keys
+        from the database, so the primary key of the model must be an `AutoField`.
+        """
+        if not isinstance(self.model._meta.pk, models.AutoField):
+            raise ValueError("Only models with auto primary keys can be cloned.")
+
+        source_kwargs = self._get_group_kwargs(source)
+        destination_kwargs = self._get_group_kwargs(destination)
+
+        if self.filter(**destination_kwargs).exists():
+            raise ValueError("Destination group must be empty.")
+
+        objs = list(self.model._get_group_queryset(source_kwargs).order_by("rank"))
+        ranks = (
+            LexoRank.get_rank_sequence(objects_count=len(objs))
+            if compact
+            else (obj.rank for obj in objs)
+        )
+
+        for obj, rank in zip(objs, ranks):
+            obj.pk = None
+            obj._state.adding = True
+            obj.rank = rank
+            for attname, value in destination_kwargs.items():
+                setattr(obj, attname, value)
+
+        objs = self.bulk_create(objs, batch_size=batch_size)
+        for obj in objs:
+            obj._store_initial_values()
+
+        return objs
+
+    @transaction.atomic
+    def merge_groups(self, source, destination, strategy: str = "append") -> int:
+        """
+        Move objects of the source group to the destination group and assign fresh
+        ranks to the merged group in one pass: after the destination objects
+        with `append` strategy, or merged by rank with `interleave` strategy.
+        Return the number of objects in the merged group.
+        """
+        source_kwargs = self._get_group_kwargs(source)
+        destination_kwargs = self._get_group_kwargs(destination)
+
+        if strategy == "append":
+            order_by = [
+                Case(
+                    When(**destination_kwargs, then=Value(0)),
+                    default=Value(1),
+                ).asc(),
+                "rank",
+                "pk",
+            ]
+        elif strategy == "interleave":
+            order_by = ["rank", "pk"]
+        else:
+            raise ValueError(f"Unknown merge strategy: {strategy}")
+
+        merged_count = update_ranks_in_database(
+            self.model.get_ranked_queryset().filter(
+                Q(**source_kwargs) | Q(**destination_kwargs)
+            ),
+            partition_by=[],
+            order_by=order_by,
+        )
+        # Objects out of the ranking scope are moved along, keeping their ranks.
+        self.filter(**source_kwargs).update(**destination_kwargs)
+
+        return merged_count
+
     def add_to_top(self, **kwargs):
         """Adds a new object to the top of the list."""
         ordering = ""
@@ -45,3 +404,13 @@ class RankedModelManager(models.Manager.from_queryset(RankedModelQuerySet)):  #
         """Adds a new object to the bottom of the list."""
         ordering = "-"
         return self._add(ordering, **kwargs)
+
+    async def aadd_to_top(self, **kwargs):
+        """Asynchronous version of `add_to_top()`."""
+        ordering = ""
+        return await self._aadd(ordering, **kwargs)
+
+    async def aadd_to_bottom(self, **kwargs):
+        """Asynchronous version of `add_to_bottom()`."""
+        ordering = "-"
+        return await self._aadd(ordering, **kwargs)
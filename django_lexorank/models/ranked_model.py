@@ -1,29 +1,30 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
-from typing import Optional, Type
+from typing import Iterable, List, Optional, Tuple, Type, Union
 
+from asgiref.sync import sync_to_async
 from django.contrib import admin
-from django.db import models, transaction
-from django.db.models import CharField
+from django.db import connections, models, transaction
+from django.db.models import Avg, CharField, Count, Max, Min, Q
 from django.db.models.functions import Length
-from django.forms.models import model_to_dict
 
 from ..fields import RankField
+from ..instrumentation import instrumented, mark_rebalancing_scheduled
 from ..lexorank import LexoRank
 from ..managers import RankedModelManager
+from ..sql import update_ranks_in_database
 from .scheduled_rebalancing import ScheduledRebalancing
 
 CharField.register_lookup(Length, "length")
 
 
 class RankedModel(models.Model):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.__initial_values = model_to_dict(self)
-
     objects = RankedModelManager()
 
     rank = RankField()
-    order_with_respect_to: Optional[str] = None
+    order_with_respect_to: Union[str, Tuple[str, ...], None] = None
+    ranking_scope: Optional[Q] = None
 
     class Meta:
         abstract = True
@@ -34,66 +35,253 @@ class RankedModel(models.Model):
         instance = super().from_db(db, field_names, values)
         instance._state.adding = False
         instance._state.db = db
-        instance._initial_values = dict(zip(field_names, values))
+        instance._loaded_row = (field_names, values)
         return instance
 
+    @cached_property
+    def _initial_values(self) -> dict:
+        """
+        Return field values (keyed by attname) as they were loaded from
+        or last saved to the database.
+        """
+        field_names, values = self.__dict__.pop("_loaded_row", ((), ()))
+        return dict(zip(field_names, values))
+
+    def _store_initial_values(self, fields=None) -> None:
+        if fields is None:
+            deferred_fields = self.get_deferred_fields()
+            attnames = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if field.attname not in deferred_fields
+            ]
+        else:
+            attnames = [self._meta.get_field(name).attname for name in fields]
+
+        self._initial_values.update(
+            {attname: getattr(self, attname) for attname in attnames}
+        )
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs) -> None:
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._store_initial_values(fields=fields)
+
     def field_value_has_changed(self, field: str) -> bool:
-        if not self.pk or not self.__initial_values:
+        """
+        Return `True` if the field value differs from the one in the database.
+        Deferred fields that were not assigned are reported as unchanged
+        without being loaded.
+        """
+        if self._state.adding or not self.pk:
             return False
 
-        current_value = getattr(self, field)
-        initial_value = self.__initial_values[field]
+        attname = self._meta.get_field(field).attname
 
-        if isinstance(current_value, models.Model):
-            current_value = current_value.pk
+        if attname not in self.__dict__:
+            return False
 
-        return current_value != initial_value
+        if attname not in self._initial_values:
+            # A deferred field was assigned before it has ever been loaded.
+            self._initial_values[attname] = (
+                self._model._base_manager.filter(pk=self.pk)
+                .values_list(attname, flat=True)
+                .first()
+            )
+
+        return self.__dict__[attname] != self._initial_values[attname]
 
     @transaction.atomic
     def save(self, *args, **kwargs) -> None:
-        if self.order_with_respect_to:
-            if self.field_value_has_changed(self.order_with_respect_to):
-                self.rank = None  # type: ignore[assignment]
+        group_changed = any(
+            self.field_value_has_changed(field)
+            for field in self._get_with_respect_to_fields()
+        )
+        if group_changed:
+            self.rank = None  # type: ignore[assignment]
+
+        # While out of the ranking scope, the rank may have been given to another
+        # object, so an object returning to the scope is placed again.
+        returning_to_scope = (
+            not group_changed
+            and self.ranking_scope is not None
+            and not self._state.adding
+            and self.pk is not None
+            and not self._is_in_ranking_scope()
+        )
 
         super().save(*args, **kwargs)
+        self._store_initial_values(fields=kwargs.get("update_fields"))
+
+        if returning_to_scope and self._is_in_ranking_scope():
+            rank = self._get_rank_in_group(self._with_respect_to_kwargs)
+            self._model.objects.filter(pk=self.pk).update(rank=rank)
+            self.rank = rank  # type: ignore[assignment]
+            self._store_initial_values(fields=["rank"])
+            self._clear_neighbours()
 
         if self.rebalancing_required():
             self.schedule_rebalancing()
 
+    def _is_in_ranking_scope(self) -> bool:
+        return self.get_ranked_queryset().filter(pk=self.pk).exists()
+
     @cached_property
     def _model(self) -> Type[models.Model]:
         return self._meta.model
 
-    @property
-    def _with_respect_to_kwargs(self) -> dict:
-        if not self.order_with_respect_to:
+    @classmethod
+    def _get_with_respect_to_fields(cls) -> Tuple[str, ...]:
+        if not cls.order_with_respect_to:
+            return ()
+
+        if isinstance(cls.order_with_respect_to, str):
+            return (cls.order_with_respect_to,)
+
+        return tuple(cls.order_with_respect_to)
+
+    @classmethod
+    def _get_with_respect_to_attnames(cls) -> List[str]:
+        return [
+            cls._meta.get_field(field).attname
+            for field in cls._get_with_respect_to_fields()
+        ]
+
+    @classmethod
+    def get_ranked_queryset(cls) -> models.QuerySet:
+        """
+        Return objects that take part in ranking: the ones matching `ranking_scope`,
+        or all objects if it is not set. Objects out of the scope keep their ranks,
+        but are not counted, placed around, or rebalanced.
+        """
+        if cls.ranking_scope is None:
+            return cls.objects.all()
+
+        return cls.objects.filter(cls.ranking_scope)
+
+    @classmethod
+    def _get_group_queryset(cls, with_respect_to_kwargs: dict) -> models.QuerySet:
+        return cls.get_ranked_queryset().filter(**with_respect_to_kwargs)
+
+    @classmethod
+    def get_group_kwargs(cls, group) -> dict:
+        """
+        Return `with_respect_to_kwargs` of a group: a value (an object or a primary key)
+        of `order_with_respect_to` field, or a tuple of values of multiple fields.
+        """
+        attnames = cls._get_with_respect_to_attnames()
+        if not attnames:
             return {}
 
-        return {self.order_with_respect_to: getattr(self, self.order_with_respect_to)}
+        values = tuple(group) if isinstance(group, (tuple, list)) else (group,)
+        if len(values) != len(attnames):
+            raise ValueError(f"Group must consist of {len(attnames)} values.")
+
+        return {
+            attname: value.pk if isinstance(value, models.Model) else value
+            for attname, value in zip(attnames, values)
+        }
+
+    @property
+    def _with_respect_to_kwargs(self) -> dict:
+        return {
+            attname: getattr(self, attname)
+            for attname in self._get_with_respect_to_attnames()
+        }
 
     @property
-    def _with_respect_to_value(self) -> str:
-        if self.order_with_respect_to:
-            return getattr(self, self.order_with_respect_to).pk
+    def _with_respect_to_value(self):
+        values = tuple(self._with_respect_to_kwargs.values())
+        if not values:
+            return ""
+
+        return values[0] if len(values) == 1 else values
+
+    @classmethod
+    def _get_scheduled_rebalancing_key(cls, with_respect_to_kwargs: dict) -> str:
+        values = list(with_respect_to_kwargs.values())
+        if len(values) > 1:
+            # Values of multiple fields are stored as a JSON list.
+            return json.dumps(
+                [None if value is None else str(value) for value in values]
+            )
+
+        if not values or values[0] is None:
+            # The group of a NULL value of a nullable field is stored as "".
+            return ""
 
-        return ""
+        return str(values[0])
+
+    @classmethod
+    def _get_scheduled_group(cls, key: str):
+        fields = cls._get_with_respect_to_fields()
+        if len(fields) > 1:
+            return json.loads(key)
+
+        if not fields:
+            return key
+
+        field = cls._meta.get_field(fields[0])
+        if key == "" and field.null:
+            return None
+
+        return field.to_python(key)
+
+    @property
+    def _scheduled_rebalancing_key(self) -> str:
+        return self._get_scheduled_rebalancing_key(self._with_respect_to_kwargs)
 
     @property
     def _objects_count(self):
-        return self._model.objects.filter(**self._with_respect_to_kwargs).count()
+        return self._get_group_queryset(self._with_respect_to_kwargs).count()
+
+    async def _aget_objects_count(self) -> int:
+        return await self._get_group_queryset(self._with_respect_to_kwargs).acount()
+
+    def _clear_neighbours(self) -> None:
+        """Drop neighbour annotations that are no longer valid after a move."""
+        for attname in ("previous_rank", "next_rank", "previous_pk", "next_pk"):
+            self.__dict__.pop(attname, None)
+
+    def _set_neighbour(self, obj: "RankedModel", following: bool) -> None:
+        """
+        Point neighbour annotations of the object to another object placed
+        right after (or before) it, so they keep reporting the current neighbour.
+        """
+        prefix = "next" if following else "previous"
+        if f"{prefix}_rank" in self.__dict__:
+            self.__dict__[f"{prefix}_rank"] = obj.rank
+        if f"{prefix}_pk" in self.__dict__:
+            self.__dict__[f"{prefix}_pk"] = obj.pk
+
+    def _get_rank_in_between(
+        self, previous_rank: Optional[str], next_rank: Optional[str], objects_count: int
+    ) -> str:
+        return self._meta.get_field("rank").get_rank_in_between(
+            previous_rank=previous_rank,
+            next_rank=next_rank,
+            objects_count=objects_count,
+        )
 
     def _move_to(self, rank: str) -> "RankedModel":
         self.rank = rank  # type: ignore[assignment]
         self.save(update_fields=["rank"])
+        self._clear_neighbours()
+        return self
+
+    async def _amove_to(self, rank: str) -> "RankedModel":
+        self.rank = rank  # type: ignore[assignment]
+        await self.asave(update_fields=["rank"])
+        self._clear_neighbours()
         return self
 
+    @instrumented("place_on_top")
     def place_on_top(self) -> "RankedModel":
         """Place object at the top of the list."""
         first_object_rank = self.get_first_object_rank(
             with_respect_to_kwargs=self._with_respect_to_kwargs
         )
 
-        rank = LexoRank.get_lexorank_in_between(  # type: ignore[assignment]
+        rank = self._get_rank_in_between(  # type: ignore[assignment]
             previous_rank=None,
             next_rank=first_object_rank,
             objects_count=self._objects_count,
@@ -101,13 +289,28 @@ class RankedModel(models.Model):
 
         return self._move_to(rank)
 
+    async def aplace_on_top(self) -> "RankedModel":
+        """Asynchronous version of `place_on_top()`."""
+        first_object_rank = await self.aget_first_object_rank(
+            with_respect_to_kwargs=self._with_respect_to_kwargs
+        )
+
+        rank = self._get_rank_in_between(  # type: ignore[assignment]
+            previous_rank=None,
+            next_rank=first_object_rank,
+            objects_count=await self._aget_objects_count(),
+        )
+
+        return await self._amove_to(rank)
+
+    @instrumented("place_on_bottom")
     def place_on_bottom(self) -> "RankedModel":
         """Place object at the bottom of the list."""
         last_object_rank = self.get_last_object_rank(
             with_respect_to_kwargs=self._with_respect_to_kwargs
         )
 
-        rank = LexoRank.get_lexorank_in_between(  # type: ignore[assignment]
+        rank = self._get_rank_in_between(  # type: ignore[assignment]
             previous_rank=last_object_rank,
             next_rank=None,
             objects_count=self._objects_count,
@@ -115,25 +318,199 @@ class RankedModel(models.Model):
 
         return self._move_to(rank)
 
+    async def aplace_on_bottom(self) -> "RankedModel":
+        """Asynchronous version of `place_on_bottom()`."""
+        last_object_rank = await self.aget_last_object_rank(
+            with_respect_to_kwargs=self._with_respect_to_kwargs
+        )
+
+        rank = self._get_rank_in_between(  # type: ignore[assignment]
+            previous_rank=last_object_rank,
+            next_rank=None,
+            objects_count=await self._aget_objects_count(),
+        )
+
+        return await self._amove_to(rank)
+
+    @instrumented("place_after")
     def place_after(self, after_obj: "RankedModel") -> "RankedModel":
         """Place object after selected one."""
         previous_rank = after_obj.rank
-        next_rank = after_obj.get_next_object_rank()
+        # Annotations may be outdated by other moves, so neighbours are queried.
+        next_object = after_obj.get_next_object()
+        next_rank = next_object.rank if next_object else None
 
-        rank = LexoRank.get_lexorank_in_between(
+        rank = self._get_rank_in_between(
             previous_rank=previous_rank,
             next_rank=next_rank,
             objects_count=self._objects_count,
         )
 
-        return self._move_to(rank)
+        self._move_to(rank)
+        after_obj._set_neighbour(self, following=True)
+        return self
 
+    async def aplace_after(self, after_obj: "RankedModel") -> "RankedModel":
+        """Asynchronous version of `place_after()`."""
+        previous_rank = after_obj.rank
+        next_object = await after_obj.aget_next_object()
+        next_rank = next_object.rank if next_object else None
+
+        rank = self._get_rank_in_between(
+            previous_rank=previous_rank,
+            next_rank=next_rank,
+            objects_count=await self._aget_objects_count(),
+        )
+
+        await self._amove_to(rank)
+        after_obj._set_neighbour(self, following=True)
+        return self
+
+    @instrumented("place_before")
     def place_before(self, before_obj: "RankedModel") -> "RankedModel":
         """Place object before selected one."""
         next_rank = before_obj.rank
-        previous_rank = before_obj.get_previous_object_rank()
+        # Annotations may be outdated by other moves, so neighbours are queried.
+        previous_object = before_obj.get_previous_object()
+        previous_rank = previous_object.rank if previous_object else None
 
-        rank = LexoRank.get_lexorank_in_between(
+        rank = self._get_rank_in_between(
+            previous_rank=previous_rank,
+            next_rank=next_rank,
+            objects_count=self._objects_count,
+        )
+
+        self._move_to(rank)
+        before_obj._set_neighbour(self, following=False)
+        return self
+
+    async def aplace_before(self, before_obj: "RankedModel") -> "RankedModel":
+        """Asynchronous version of `place_before()`."""
+        next_rank = before_obj.rank
+        previous_object = await before_obj.aget_previous_object()
+        previous_rank = previous_object.rank if previous_object else None
+
+        rank = self._get_rank_in_between(
+            previous_rank=previous_rank,
+            next_rank=next_rank,
+            objects_count=await self._aget_objects_count(),
+        )
+
+        await self._amove_to(rank)
+        before_obj._set_neighbour(self, following=False)
+        return self
+
+    def _get_rank_in_group(
+        self,
+        group_kwargs: dict,
+        after: Optional["RankedModel"] = None,
+        before: Optional["RankedModel"] = None,
+    ) -> str:
+        """
+        Return a rank placing the object after or before the provided object
+        of a group, or on the top or bottom of it, with a single query for
+        neighbour ranks that ignores the object's current rank.
+        """
+        if after:
+            aggregates = {"next_rank": Min("rank", filter=Q(rank__gt=after.rank))}
+        elif before:
+            aggregates = {"previous_rank": Max("rank", filter=Q(rank__lt=before.rank))}
+        elif self._meta.get_field("rank").insert_to_bottom:
+            aggregates = {"previous_rank": Max("rank")}
+        else:
+            aggregates = {"next_rank": Min("rank")}
+
+        stats = (
+            self._get_group_queryset(group_kwargs)
+            .exclude(pk=self.pk)
+            .aggregate(objects_count=Count("pk"), **aggregates)
+        )
+
+        previous_rank = after.rank if after else stats.get("previous_rank")
+        next_rank = before.rank if before else stats.get("next_rank")
+        rank = self._get_rank_in_between(
+            previous_rank=previous_rank,
+            next_rank=next_rank,
+            objects_count=stats["objects_count"] + 1,
+        )
+        if not previous_rank and not next_rank:
+            rank = self._meta.get_field("rank").with_bucket(rank)
+
+        return rank
+
+    @instrumented("move_to_group")
+    @transaction.atomic
+    def move_to_group(
+        self,
+        group,
+        after: Optional["RankedModel"] = None,
+        before: Optional["RankedModel"] = None,
+    ) -> "RankedModel":
+        """
+        Move object to another group, placing it after or before the provided
+        object of that group, or on the top or bottom according to `RankField`
+        definition. Neighbour ranks are fetched with a single query and the
+        object is updated with a single UPDATE, without calling `save()`.
+        """
+        if not self.order_with_respect_to:
+            raise ValueError("order_with_respect_to must be set")
+
+        if after and before:
+            raise ValueError("Only one of after and before can be provided.")
+
+        group_kwargs = self.get_group_kwargs(group)
+        target = after or before
+        if target and target._with_respect_to_kwargs != group_kwargs:
+            raise ValueError("Target object must belong to the group.")
+
+        rank = self._get_rank_in_group(group_kwargs, after=after, before=before)
+        self._model.objects.filter(pk=self.pk).update(**group_kwargs, rank=rank)
+
+        values = tuple(group) if isinstance(group, (tuple, list)) else (group,)
+        for field, attname, value in zip(
+            self._get_with_respect_to_fields(), group_kwargs, values
+        ):
+            if isinstance(value, models.Model):
+                setattr(self, field, value)
+            else:
+                setattr(self, attname, value)
+        self.rank = rank  # type: ignore[assignment]
+        self._store_initial_values(fields=[*group_kwargs, "rank"])
+        self._clear_neighbours()
+
+        if self.rebalancing_required():
+            self.schedule_rebalancing()
+
+        return self
+
+    @instrumented("place_at")
+    def place_at(self, position: int) -> "RankedModel":
+        """
+        Place object at the provided zero-based position of the list.
+        Positions past the end of the list place the object on the bottom.
+        """
+        if position < 0:
+            raise ValueError("Position must not be negative.")
+
+        # Fetch ranks of both future neighbours with a single query.
+        start, end = max(position - 1, 0), position + 1
+        neighbour_ranks = list(
+            self._get_group_queryset(self._with_respect_to_kwargs)
+            .exclude(pk=self.pk)
+            .order_by("rank")
+            .values_list("rank", flat=True)[start:end]
+        )
+
+        if position == 0:
+            previous_rank = None
+            next_rank = neighbour_ranks[0] if neighbour_ranks else None
+        elif neighbour_ranks:
+            previous_rank = neighbour_ranks[0]
+            next_rank = neighbour_ranks[1] if len(neighbour_ranks) > 1 else None
+        else:
+            return self.place_on_bottom()
+
+        rank = self._get_rank_in_between(
             previous_rank=previous_rank,
             next_rank=next_rank,
             objects_count=self._objects_count,
@@ -141,85 +518,458 @@ class RankedModel(models.Model):
 
         return self._move_to(rank)
 
+    def get_position(self) -> int:
+        """Return zero-based position of the object in the list."""
+        return (
+            self._get_group_queryset(self._with_respect_to_kwargs)
+            .filter(rank__lt=self.rank)
+            .count()
+        )
+
     def get_previous_object(self) -> Optional["RankedModel"]:
         """
         Return object that precedes provided object,
         or None if provided object is the first.
         """
         return (
-            self._model.objects.filter(
-                rank__lt=self.rank, **self._with_respect_to_kwargs
-            )
+            self._get_group_queryset(self._with_respect_to_kwargs)
+            .filter(rank__lt=self.rank)
             .order_by("-rank")
             .first()
         )
 
+    async def aget_previous_object(self) -> Optional["RankedModel"]:
+        """Asynchronous version of `get_previous_object()`."""
+        return (
+            await self._get_group_queryset(self._with_respect_to_kwargs)
+            .filter(rank__lt=self.rank)
+            .order_by("-rank")
+            .afirst()
+        )
+
     def get_previous_object_rank(self) -> Optional[str]:
         """
         Return object rank that precedes provided object,
         or None if provided object is the first.
+        Uses `previous_rank` annotation added by `with_neighbours()` if present.
         """
+        if "previous_rank" in self.__dict__:
+            return self.__dict__["previous_rank"]
+
         previous_object = self.get_previous_object()
         return previous_object.rank if previous_object else None
 
+    async def aget_previous_object_rank(self) -> Optional[str]:
+        """Asynchronous version of `get_previous_object_rank()`."""
+        if "previous_rank" in self.__dict__:
+            return self.__dict__["previous_rank"]
+
+        previous_object = await self.aget_previous_object()
+        return previous_object.rank if previous_object else None
+
     def get_next_object(self) -> Optional["RankedModel"]:
         """
         Return object that follows provided object,
         or None if provided object is the last.
         """
         return (
-            self._model.objects.filter(
-                rank__gt=self.rank, **self._with_respect_to_kwargs
-            )
+            self._get_group_queryset(self._with_respect_to_kwargs)
+            .filter(rank__gt=self.rank)
             .order_by("rank")
             .first()
         )
 
+    async def aget_next_object(self) -> Optional["RankedModel"]:
+        """Asynchronous version of `get_next_object()`."""
+        return (
+            await self._get_group_queryset(self._with_respect_to_kwargs)
+            .filter(rank__gt=self.rank)
+            .order_by("rank")
+            .afirst()
+        )
+
     def get_next_object_rank(self) -> Optional[str]:
         """
         Return object rank that follows provided object,
         or None if provided object is the last.
+        Uses `next_rank` annotation added by `with_neighbours()` if present.
         """
+        if "next_rank" in self.__dict__:
+            return self.__dict__["next_rank"]
+
         next_object = self.get_next_object()
         return next_object.rank if next_object else None
 
+    async def aget_next_object_rank(self) -> Optional[str]:
+        """Asynchronous version of `get_next_object_rank()`."""
+        if "next_rank" in self.__dict__:
+            return self.__dict__["next_rank"]
+
+        next_object = await self.aget_next_object()
+        return next_object.rank if next_object else None
+
+    @instrumented("rebalance")
+    def rebalance(
+        self, in_database: bool = False, compact: bool = False
+    ) -> "RankedModel":
+        """
+        Rebalance ranks of all objects.
+        If `in_database` is `True`, the ranks are calculated by the database.
+        If `compact` is `True`, the shortest ranks fitting the group are assigned.
+        """
+        self.rebalance_group(
+            with_respect_to_kwargs=self._with_respect_to_kwargs,
+            in_database=in_database,
+            compact=compact,
+        )
+        self.refresh_from_db()
+
+        return self
+
+    async def arebalance(
+        self, in_database: bool = False, compact: bool = False
+    ) -> "RankedModel":
+        """
+        Asynchronous version of `rebalance()`.
+        Runs in a thread, since transactions are not supported in async mode.
+        """
+        return await sync_to_async(self.rebalance)(
+            in_database=in_database, compact=compact
+        )
+
+    @classmethod
+    @transaction.atomic
+    def rebalance_in_database(
+        cls, with_respect_to_kwargs: Optional[dict] = None
+    ) -> int:
+        """
+        Rebalance ranks of a group, or of all groups if `with_respect_to_kwargs`
+        is not provided, with a single UPDATE statement that numbers objects
+        with `ROW_NUMBER()`. Supported on PostgreSQL and SQLite 3.33+.
+        Return the number of updated objects.
+        """
+        return update_ranks_in_database(
+            cls._get_group_queryset(with_respect_to_kwargs or {}),
+            partition_by=cls._get_with_respect_to_attnames(),
+            order_by=["rank", "pk"],
+        )
+
+    @classmethod
+    def rebalance_group(
+        cls,
+        with_respect_to_kwargs: dict,
+        in_database: bool = False,
+        compact: bool = False,
+    ) -> None:
+        """
+        Rebalance ranks of all objects in a group.
+        Groups of bucketed models are moved to the next bucket in batches.
+        With `compact`, ranks of the shortest length fitting the group are assigned,
+        leaving at least `LexoRank.compact_rank_gap` free ranks around each object.
+        """
+        if cls.order_with_respect_to and not with_respect_to_kwargs:
+            raise ValueError("with_respect_to_kwargs must be provided")
+
+        if in_database:
+            if compact:
+                raise ValueError("Compact rebalancing in database is not supported.")
+            cls.rebalance_in_database(with_respect_to_kwargs=with_respect_to_kwargs)
+        elif cls._meta.get_field("rank").bucketed:
+            cls.rebalance_to_next_bucket(
+                with_respect_to_kwargs=with_respect_to_kwargs, compact=compact
+            )
+        else:
+            cls._rebalance_group_in_place(
+                with_respect_to_kwargs=with_respect_to_kwargs, compact=compact
+            )
+
+    @classmethod
     @transaction.atomic
-    def rebalance(self) -> "RankedModel":
-        """Rebalance ranks of all objects."""
+    def _rebalance_group_in_place(
+        cls, with_respect_to_kwargs: dict, compact: bool = False
+    ) -> None:
         qs = (
-            self._model.objects.filter(**self._with_respect_to_kwargs)
+            cls._get_group_queryset(with_respect_to_kwargs)
             .order_by("rank")
             .select_for_update()
         )
 
         objects_to_update = []
+        objects_count = qs.count()
 
-        rank = LexoRank.get_min_rank(
-            objects_count=self._objects_count,
-        )
-        for obj in qs:
-            rank = LexoRank.increment_rank(
-                rank=rank,
-                objects_count=self._objects_count,
-            )
+        if compact:
+            ranks = LexoRank.get_compact_ranks(objects_count=objects_count)
+        else:
+            ranks = LexoRank.get_rank_sequence(objects_count=objects_count)
+
+        for obj, rank in zip(qs, ranks):
             obj.rank = rank
             objects_to_update.append(obj)
 
-        self._model.objects.bulk_update(objects_to_update, ["rank"])
+        cls.objects.bulk_update(objects_to_update, ["rank"])
 
-        self.refresh_from_db()
+    @classmethod
+    def _get_bucket_rebalancing_state(
+        cls, qs: models.QuerySet
+    ) -> Tuple[Optional[str], str]:
+        """
+        Return the bucket objects of the group are moved from and the bucket
+        they are moved to, resuming a rebalancing that was interrupted.
+        """
+        first_rank = qs.order_by("rank").values_list("rank", flat=True).first()
+        last_rank = qs.order_by("-rank").values_list("rank", flat=True).first()
+        first_bucket, _ = LexoRank.split_bucket(first_rank)
+        last_bucket, _ = LexoRank.split_bucket(last_rank)
 
-        return self
+        if first_bucket == last_bucket:
+            return first_bucket, LexoRank.get_next_bucket(first_bucket)
+
+        if last_bucket is None:
+            # Ranks without a bucket go after the bucketed ones.
+            return None, first_bucket
+
+        if LexoRank.get_next_bucket(first_bucket) == last_bucket:
+            return first_bucket, last_bucket
+
+        return last_bucket, first_bucket
+
+    @classmethod
+    def rebalance_to_next_bucket(
+        cls, with_respect_to_kwargs: dict, batch_size: int = 100, compact: bool = False
+    ) -> int:
+        """
+        Move objects of a group to the next rank bucket with evenly spaced ranks,
+        one batch per transaction and one UPDATE per object, without locking
+        the whole group. Objects are moved starting from the end of the list
+        adjacent to the next bucket, so the order stays consistent for readers
+        and writers at any moment. With `compact`, the shortest ranks fitting
+        the group are assigned unless the previous rebalancing was interrupted.
+        Return the number of moved objects.
+        """
+        qs = cls._get_group_queryset(with_respect_to_kwargs)
+        if not qs.exists():
+            return 0
+
+        source_bucket, target_bucket = cls._get_bucket_rebalancing_state(qs)
+        if source_bucket is None:
+            source_qs = qs.exclude(rank__contains=LexoRank.bucket_separator)
+        else:
+            source_qs = qs.filter(
+                rank__startswith=LexoRank.join_bucket(source_bucket, "")
+            )
+        target_qs = qs.filter(rank__startswith=LexoRank.join_bucket(target_bucket, ""))
+
+        # Objects move from the end of the source bucket if the target bucket
+        # goes after it, and from the start when wrapping around to the first one.
+        from_end = source_bucket is not None and target_bucket > source_bucket
+        if from_end:
+            boundary_rank = target_qs.order_by("rank").values_list("rank", flat=True)
+        else:
+            boundary_rank = target_qs.order_by("-rank").values_list("rank", flat=True)
+        boundary_rank = boundary_rank.first()
+        boundary = LexoRank.split_bucket(boundary_rank)[1] if boundary_rank else None
+
+        objects_count = qs.count()
+        if not boundary_rank:
+            get_outermost_rank = (
+                LexoRank.get_max_rank if from_end else LexoRank.get_min_rank
+            )
+            boundary_rank = LexoRank.join_bucket(
+                target_bucket, get_outermost_rank(objects_count=objects_count)
+            )
+        if compact and not boundary:
+            ranks = LexoRank.get_compact_ranks(objects_count=source_qs.count())
+        else:
+            ranks = LexoRank.get_lexoranks_in_between(
+                previous_rank=None if from_end else boundary,
+                next_rank=boundary if from_end else None,
+                count=source_qs.count(),
+                objects_count=objects_count,
+            )
+        if not from_end:
+            ranks.reverse()
+
+        moved_count = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    source_qs.order_by("-rank" if from_end else "rank")
+                    .select_for_update()
+                    .values_list("pk", "rank")[:batch_size]
+                )
+                if not batch:
+                    break
+
+                for pk, rank in batch:
+                    if ranks:
+                        new_rank = LexoRank.join_bucket(target_bucket, ranks.pop())
+                    else:
+                        # Objects added to the source bucket during rebalancing.
+                        new_rank = LexoRank.get_lexorank_in_between(
+                            previous_rank=None if from_end else boundary_rank,
+                            next_rank=boundary_rank if from_end else None,
+                            objects_count=objects_count,
+                        )
+
+                    # Objects moved by others in the meantime are picked up again.
+                    if cls.objects.filter(pk=pk, rank=rank).update(rank=new_rank):
+                        moved_count += 1
+                        boundary_rank = new_rank
+
+        return moved_count
+
+    @classmethod
+    def _get_rank_length_expression(cls):
+        """Return database expression of rank length without the bucket prefix."""
+        if cls._meta.get_field("rank").bucketed:
+            bucket_prefix = LexoRank.join_bucket(LexoRank.default_bucket, "")
+            return Length("rank") - len(bucket_prefix)
+
+        return Length("rank")
+
+    @classmethod
+    def get_groups_requiring_rebalancing(cls) -> list:
+        """
+        Return values of `order_with_respect_to` field (tuples of values for
+        multiple fields) of the groups that have objects with rank length
+        of at least `LexoRank.rebalancing_length`, using a single aggregate query.
+        For models ranked globally, return `[""]` if rebalancing is required.
+        """
+        attnames = cls._get_with_respect_to_attnames()
+        if not attnames:
+            required = (
+                cls.get_ranked_queryset()
+                .alias(rank_length=cls._get_rank_length_expression())
+                .filter(rank_length__gte=LexoRank.rebalancing_length)
+                .exists()
+            )
+            return [""] if required else []
+
+        return list(
+            cls.get_ranked_queryset()
+            .order_by()
+            .values(*attnames)
+            .annotate(max_rank_length=Max(cls._get_rank_length_expression()))
+            .filter(max_rank_length__gte=LexoRank.rebalancing_length)
+            .values_list(*attnames, flat=len(attnames) == 1)
+        )
+
+    @classmethod
+    def get_rank_stats(cls, limit: Optional[int] = None) -> List[dict]:
+        """
+        Return rank statistics per group, computed with a single aggregate query:
+        number of objects, maximum and average rank length and number of
+        duplicate ranks. Groups closest to `LexoRank.rebalancing_length` go first.
+        """
+        aggregates = {
+            "objects_count": Count("pk"),
+            "max_rank_length": Max(cls._get_rank_length_expression()),
+            "avg_rank_length": Avg(cls._get_rank_length_expression()),
+            "duplicate_ranks": Count("pk") - Count("rank", distinct=True),
+        }
+
+        attnames = cls._get_with_respect_to_attnames()
+        if not attnames:
+            stats = cls.get_ranked_queryset().order_by().aggregate(**aggregates)
+            rows = [{"group": "", **stats}] if stats["objects_count"] else []
+        else:
+            qs = (
+                cls.get_ranked_queryset()
+                .values(*attnames)
+                .annotate(**aggregates)
+                .order_by("-max_rank_length", *attnames)
+            )
+            if limit is not None:
+                qs = qs[:limit]
+            rows = []
+            for row in qs:
+                group = tuple(row.pop(attname) for attname in attnames)
+                rows.append({"group": group if len(group) > 1 else group[0], **row})
+
+        for row in rows:
+            row["rebalancing_required"] = (
+                row["max_rank_length"] >= LexoRank.rebalancing_length
+            )
+
+        return rows
+
+    @classmethod
+    def get_groups(cls) -> list:
+        """
+        Return values of `order_with_respect_to` field (tuples of values for
+        multiple fields) of all groups, or `[""]` for models ranked globally.
+        """
+        attnames = cls._get_with_respect_to_attnames()
+        if not attnames:
+            return [""]
+
+        return list(
+            cls.get_ranked_queryset()
+            .order_by()
+            .values_list(*attnames, flat=len(attnames) == 1)
+            .distinct()
+        )
+
+    @classmethod
+    def rebalance_all(
+        cls,
+        groups: Optional[Iterable] = None,
+        workers: int = 1,
+        in_database: bool = False,
+        compact: bool = False,
+    ) -> int:
+        """
+        Rebalance provided groups, or all groups that require rebalancing.
+        With more than one worker, groups are split between a pool of threads
+        rebalancing them concurrently, each using its own database connection.
+        Return the number of rebalanced groups.
+        """
+        if groups is None:
+            groups = cls.get_groups_requiring_rebalancing()
+
+        if cls.order_with_respect_to:
+            groups_kwargs = [cls.get_group_kwargs(group) for group in groups]
+        else:
+            groups_kwargs = [{}] if list(groups) else []
+
+        def rebalance_group(with_respect_to_kwargs: dict) -> None:
+            cls.rebalance_group(
+                with_respect_to_kwargs=with_respect_to_kwargs,
+                in_database=in_database,
+                compact=compact,
+            )
+
+        if workers <= 1:
+            for with_respect_to_kwargs in groups_kwargs:
+                rebalance_group(with_respect_to_kwargs)
+            return len(groups_kwargs)
+
+        def rebalance_groups_in_thread(chunk: List[dict]) -> None:
+            # Each thread connects once and closes its connection when done.
+            try:
+                for with_respect_to_kwargs in chunk:
+                    rebalance_group(with_respect_to_kwargs)
+            finally:
+                connections.close_all()
+
+        chunks = [groups_kwargs[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume results to propagate exceptions raised in workers.
+            list(executor.map(rebalance_groups_in_thread, filter(None, chunks)))
+
+        return len(groups_kwargs)
 
     @admin.display(boolean=True)
     def rebalancing_required(self) -> bool:
         """
         Return `True` if any object has rank length greater than 128, `False` otherwise.
         """
-        return self._model.objects.filter(
-            rank__length__gte=LexoRank.rebalancing_length,
-            **self._with_respect_to_kwargs
-        ).exists()
+        return (
+            self._get_group_queryset(self._with_respect_to_kwargs)
+            .alias(rank_length=self._get_rank_length_expression())
+            .filter(rank_length__gte=LexoRank.rebalancing_length)
+            .exists()
+        )
 
     @admin.display(boolean=True)
     def rebalancing_scheduled(self) -> bool:
@@ -229,7 +979,7 @@ class RankedModel(models.Model):
         """
         return ScheduledRebalancing.objects.filter(
             model=self._meta.model_name,
-            with_respect_to=self._with_respect_to_value,
+            with_respect_to=self._scheduled_rebalancing_key,
         ).exists()
 
     @classmethod
@@ -238,7 +988,7 @@ class RankedModel(models.Model):
         if cls.order_with_respect_to and not with_respect_to_kwargs:
             raise ValueError("with_respect_to_kwargs must be provided")
 
-        return cls.objects.filter(**with_respect_to_kwargs).order_by("rank").first()
+        return cls._get_group_queryset(with_respect_to_kwargs).order_by("rank").first()
 
     @classmethod
     def get_first_object_rank(cls, with_respect_to_kwargs: dict) -> Optional[str]:
@@ -251,13 +1001,28 @@ class RankedModel(models.Model):
         )
         return first_object.rank if first_object else None
 
+    @classmethod
+    async def aget_first_object_rank(
+        cls, with_respect_to_kwargs: dict
+    ) -> Optional[str]:
+        """Asynchronous version of `get_first_object_rank()`."""
+        if cls.order_with_respect_to and not with_respect_to_kwargs:
+            raise ValueError("with_respect_to_kwargs must be provided")
+
+        first_object = (
+            await cls._get_group_queryset(with_respect_to_kwargs)
+            .order_by("rank")
+            .afirst()
+        )
+        return first_object.rank if first_object else None
+
     @classmethod
     def get_last_object(cls, with_respect_to_kwargs: dict) -> Optional["RankedModel"]:
         """Return the last object if exists."""
         if cls.order_with_respect_to and not with_respect_to_kwargs:
             raise ValueError("with_respect_to_kwargs must be provided")
 
-        return cls.objects.filter(**with_respect_to_kwargs).order_by("-rank").first()
+        return cls._get_group_queryset(with_respect_to_kwargs).order_by("-rank").first()
 
     @classmethod
     def get_last_object_rank(cls, with_respect_to_kwargs: dict) -> Optional[str]:
@@ -268,8 +1033,94 @@ class RankedModel(models.Model):
         last_object = cls.get_last_object(with_respect_to_kwargs=with_respect_to_kwargs)
         return last_object.rank if last_object else None
 
+    @classmethod
+    def get_object_at(
+        cls, position: int, with_respect_to_kwargs: dict
+    ) -> Optional["RankedModel"]:
+        """
+        Return the object at the provided zero-based position of the list,
+        or None if the position is past the end of the list.
+        """
+        if cls.order_with_respect_to and not with_respect_to_kwargs:
+            raise ValueError("with_respect_to_kwargs must be provided")
+
+        if position < 0:
+            raise ValueError("Position must not be negative.")
+
+        end = position + 1
+        objects = list(
+            cls._get_group_queryset(with_respect_to_kwargs).order_by("rank")[
+                position:end
+            ]
+        )
+        return objects[0] if objects else None
+
+    @classmethod
+    async def aget_last_object_rank(cls, with_respect_to_kwargs: dict) -> Optional[str]:
+        """Asynchronous version of `get_last_object_rank()`."""
+        if cls.order_with_respect_to and not with_respect_to_kwargs:
+            raise ValueError("with_respect_to_kwargs must be provided")
+
+        last_object = (
+            await cls._get_group_queryset(with_respect_to_kwargs)
+            .order_by("-rank")
+            .afirst()
+        )
+        return last_object.rank if last_object else None
+
+    @instrumented("schedule_rebalancing")
     def schedule_rebalancing(self):
+        mark_rebalancing_scheduled()
         ScheduledRebalancing.objects.update_or_create(
             model=self._meta.model_name,
-            with_respect_to=self._with_respect_to_value,
+            with_respect_to=self._scheduled_rebalancing_key,
+        )
+
+    @classmethod
+    def schedule_groups_rebalancing(cls, groups: Iterable) -> int:
+        """
+        Schedule rebalancing of provided groups, skipping the ones already
+        scheduled, with a single query for existing schedules and a single insert.
+        Return the number of newly scheduled groups.
+        """
+        model_name = cls._meta.model_name
+        keys = {
+            cls._get_scheduled_rebalancing_key(cls.get_group_kwargs(group))
+            for group in groups
+        }
+        scheduled = ScheduledRebalancing.objects.filter(
+            model=model_name, with_respect_to__in=keys
+        ).values_list("with_respect_to", flat=True)
+
+        new_keys = sorted(keys.difference(scheduled))
+        ScheduledRebalancing.objects.bulk_create(
+            ScheduledRebalancing(model=model_name, with_respect_to=key)
+            for key in new_keys
+        )
+
+        return len(new_keys)
+
+    @classmethod
+    def rebalance_scheduled(
+        cls, workers: int = 1, in_database: bool = False, compact: bool = False
+    ) -> int:
+        """
+        Rebalance groups with scheduled rebalancing like `rebalance_all()` does
+        and delete their schedules. Return the number of rebalanced groups.
+        """
+        scheduled = list(
+            ScheduledRebalancing.objects.filter(model=cls._meta.model_name).values_list(
+                "pk", "with_respect_to"
+            )
+        )
+        keys = dict.fromkeys(key for _, key in scheduled)
+
+        rebalanced = cls.rebalance_all(
+            groups=[cls._get_scheduled_group(key) for key in keys],
+            workers=workers,
+            in_database=in_database,
+            compact=compact,
         )
+        ScheduledRebalancing.objects.filter(pk__in=[pk for pk, _ in scheduled]).delete()
+
+        return rebalanced
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent after a ranking operation completes, only when it has receivers.
+# Arguments: operation, instance, group, queries, duration, rank_length,
+# rebalancing_scheduled.
+ranking_operation = Signal()
@@ -0,0 +1,159 @@
+from typing import List, Sequence, Tuple, Union
+
+from django.db import NotSupportedError, connections, router
+from django.db.models import Count, Expression, F, QuerySet, Window
+from django.db.models.functions import RowNumber
+
+from .lexorank import LexoRank
+
+# Largest rank length whose numeric value fits into a signed 64-bit integer.
+MAX_DATABASE_RANK_LENGTH = 13
+
+SUPPORTED_VENDORS = {"postgresql": "CHR", "sqlite": "CHAR"}
+
+
+def get_rank_length_thresholds() -> List[Tuple[int, int]]:
+    """
+    Return `(max_objects_count, rank_length)` pairs matching
+    `LexoRank.get_rank_length()` for rank lengths that fit into a bigint.
+    """
+    thresholds = []
+    objects_count = 1
+    max_objects_count = LexoRank.base**MAX_DATABASE_RANK_LENGTH
+
+    while objects_count <= max_objects_count:
+        rank_length = LexoRank.get_rank_length(objects_count)
+        if rank_length > MAX_DATABASE_RANK_LENGTH:
+            break
+
+        # `get_rank_length()` is monotonic, so the last count with the same
+        # length can be found with exponential and then binary search.
+        low, high = objects_count, objects_count * 2
+        while high <= max_objects_count and (
+            LexoRank.get_rank_length(high) == rank_length
+        ):
+            low, high = high, high * 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if LexoRank.get_rank_length(middle) == rank_length:
+                low = middle
+            else:
+                high = middle
+
+        thresholds.append((low, rank_length))
+        objects_count = low + 1
+
+    return thresholds
+
+
+def get_rank_sql(
+    row_number: str,
+    objects_count: str,
+    vendor: str,
+    prefix: str = "",
+    default: str = "NULL",
+) -> str:
+    """
+    Return SQL expression that encodes the `row_number`-th of `objects_count`
+    ranks exactly like `LexoRank.get_min_rank()` followed by `row_number` calls
+    of `LexoRank.increment_rank()` does, prepended with `prefix`.
+    Evaluate to `default` for more objects than ranks that fit into a bigint.
+    """
+    chr_function = SUPPORTED_VENDORS[vendor]
+    first_symbol = ord(LexoRank.first_symbol)
+
+    cases = []
+    for max_objects_count, rank_length in get_rank_length_thresholds():
+        max_rank = LexoRank.base**rank_length
+        step = f"((2 * {max_rank} - {objects_count}) / (2 * {objects_count}))"
+        value = f"({row_number} * {step})"
+        symbols = " || ".join(
+            [f"'{prefix}'"] * bool(prefix)
+            + [
+                f"{chr_function}(CAST({first_symbol} + "
+                f"({value} / {LexoRank.base ** position}) % {LexoRank.base} "
+                f"AS INTEGER))"
+                for position in reversed(range(rank_length))
+            ]
+        )
+        cases.append(f"WHEN {objects_count} <= {max_objects_count} THEN {symbols}")
+
+    return f"CASE {' '.join(cases)} ELSE {default} END"
+
+
+def get_order_by_expression(field: Union[str, Expression]) -> Expression:
+    """
+    Return ordering expression for a field name, placing NULLs last in ascending
+    and first in descending order explicitly, since backends differ by default.
+    """
+    if not isinstance(field, str):
+        return field
+
+    if field.startswith("-"):
+        return F(field[1:]).desc(nulls_first=True)
+
+    return F(field).asc(nulls_last=True)
+
+
+def update_ranks_in_database(
+    queryset: QuerySet,
+    partition_by: Sequence[str],
+    order_by: Sequence[Union[str, Expression]],
+) -> int:
+    """
+    Assign evenly spaced ranks to objects of the queryset in a single
+    UPDATE statement, numbering them per partition in the given order.
+    Return the number of updated rows.
+    """
+    model = queryset.model
+    using = router.db_for_write(model)
+    connection = connections[using]
+
+    if connection.vendor not in SUPPORTED_VENDORS:
+        raise NotSupportedError(
+            f"Rebalancing in database is not supported on {connection.vendor}."
+        )
+
+    partition_expressions = [F(field) for field in partition_by] or None
+    subquery = (
+        queryset.order_by()
+        .annotate(
+            object_pk=F("pk"),
+            row_number=Window(
+                RowNumber(),
+                partition_by=partition_expressions,
+                order_by=[get_order_by_expression(field) for field in order_by],
+            ),
+            objects_count=Window(Count("pk"), partition_by=partition_expressions),
+        )
+        .values_list("object_pk", "row_number", "objects_count")
+    )
+    subquery_sql, params = subquery.query.get_compiler(using=using).as_sql()
+
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    pk_column = quote_name(model._meta.pk.column)
+    rank_column = quote_name(model._meta.get_field("rank").column)
+    bucket_prefix = (
+        LexoRank.join_bucket(LexoRank.default_bucket, "")
+        if model._meta.get_field("rank").bucketed
+        else ""
+    )
+    # Groups too large for ranks that fit into a bigint keep their ranks.
+    rank_sql = get_rank_sql(
+        row_number='"ranked"."row_number"',
+        objects_count='"ranked"."objects_count"',
+        vendor=connection.vendor,
+        prefix=bucket_prefix,
+        default=f"{table}.{rank_column}",
+    )
+
+    sql = (
+        f"UPDATE {table} SET {rank_column} = {rank_sql} "
+        f'FROM ({subquery_sql}) AS "ranked" '
+        f'WHERE {table}.{pk_column} = "ranked"."object_pk"'
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
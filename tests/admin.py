@@ -0,0 +1,7 @@
+from django.contrib import admin
+
+from django_lexorank.admin import RankedModelAdmin
+
+from .models import Board, Note, Story, Task
+
+admin.site.register([Board, Note, Story, Task], RankedModelAdmin)
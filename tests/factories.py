@@ -2,7 +2,7 @@ import factory
 
 from django_lexorank.models import ScheduledRebalancing
 
-from .models import Board, Task, Team, User
+from .models import Board, Card, Note, Story, Task, Team, User
 
 
 class TeamFactory(factory.django.DjangoModelFactory):
@@ -36,6 +36,30 @@ class TaskFactory(factory.django.DjangoModelFactory):
     name = factory.Sequence(lambda n: f"task_{n}")
 
 
+class CardFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Card
+
+    board = factory.SubFactory(BoardFactory)
+    name = factory.Sequence(lambda n: f"card_{n}")
+
+
+class StoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Story
+
+    board = factory.SubFactory(BoardFactory)
+    name = factory.Sequence(lambda n: f"story_{n}")
+
+
+class NoteFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Note
+
+    board = None
+    name = factory.Sequence(lambda n: f"note_{n}")
+
+
 class ScheduledRebalancingFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = ScheduledRebalancing
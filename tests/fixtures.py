@@ -2,7 +2,10 @@ import pytest
 
 from .factories import (
     BoardFactory,
+    CardFactory,
+    NoteFactory,
     ScheduledRebalancingFactory,
+    StoryFactory,
     TaskFactory,
     TeamFactory,
     UserFactory,
@@ -49,6 +52,21 @@ def task(task_factory):
     return task_factory()
 
 
+@pytest.fixture
+def card_factory():
+    return CardFactory
+
+
 @pytest.fixture
 def scheduled_rebalancing_factory():
     return ScheduledRebalancingFactory
+
+
+@pytest.fixture
+def story_factory():
+    return StoryFactory
+
+
+@pytest.fixture
+def note_factory():
+    return NoteFactory
@@ -0,0 +1,6 @@
+import django
+import pytest
+
+requires_async_orm = pytest.mark.skipif(
+    django.VERSION < (4, 2), reason="Async ORM requires Django 4.2+"
+)
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 
 from django_lexorank.fields import RankField
 from django_lexorank.models import RankedModel
@@ -28,3 +29,38 @@ class Task(RankedModel):
     assigned_to = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="tasks"
     )
+    due_date = models.DateField(null=True, blank=True)
+
+
+class Card(RankedModel):
+    name = models.CharField(max_length=255)
+    rank = RankField(bucketed=True)
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="cards")
+    order_with_respect_to = "board"
+
+
+class Story(RankedModel):
+    name = models.CharField(max_length=255)
+    archived = models.BooleanField(default=False)
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="stories")
+    swimlane = models.CharField(max_length=255, default="")
+    order_with_respect_to = ("board", "swimlane")
+    ranking_scope = Q(archived=False)
+
+
+class Note(RankedModel):
+    name = models.CharField(max_length=255)
+
+    board = models.ForeignKey(
+        Board, on_delete=models.CASCADE, null=True, blank=True, related_name="notes"
+    )
+    order_with_respect_to = "board"
+
+
+class Label(RankedModel):
+    code = models.CharField(max_length=255, primary_key=True)
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="labels")
+    order_with_respect_to = "board"
@@ -0,0 +1,185 @@
+import json
+from unittest.mock import patch
+
+from django.urls import reverse
+
+from django_lexorank.admin import RankedModelAdmin
+from django_lexorank.models import ScheduledRebalancing
+
+from .models import Task
+
+
+def test_rebalance_action_schedules_rebalancing_of_selected_groups_once(
+    admin_client, task_factory, board_factory, scheduled_rebalancing_factory
+):
+    # given
+    board, another_board, unselected_board = board_factory.create_batch(3)
+    tasks = [
+        *task_factory.create_batch(2, board=board),
+        task_factory.create(board=another_board),
+    ]
+    task_factory.create(board=unselected_board)
+    scheduled_rebalancing_factory.create(model="task", with_respect_to=board.pk)
+
+    # when
+    response = admin_client.post(
+        reverse("admin:tests_task_changelist"),
+        {"action": "rebalance_ranks", "_selected_action": [task.pk for task in tasks]},
+    )
+
+    # then
+    assert response.status_code == 302
+    assert sorted(
+        ScheduledRebalancing.objects.values_list("model", "with_respect_to")
+    ) == [("task", str(board.pk)), ("task", str(another_board.pk))]
+
+
+def test_rebalance_action_schedules_rebalancing_of_globally_ranked_model(
+    admin_client, board_factory
+):
+    # given
+    boards = board_factory.create_batch(2)
+
+    # when
+    admin_client.post(
+        reverse("admin:tests_board_changelist"),
+        {"action": "rebalance_ranks", "_selected_action": [b.pk for b in boards]},
+    )
+
+    # then
+    assert list(
+        ScheduledRebalancing.objects.values_list("model", "with_respect_to")
+    ) == [("board", "")]
+
+
+def test_reorder_view_lists_groups_and_objects_of_a_group(
+    admin_client, story_factory, board
+):
+    # given
+    story = story_factory.create(board=board, swimlane="todo")
+    url = reverse("admin:tests_story_reorder")
+
+    # when
+    groups_response = admin_client.get(url)
+    group_response = admin_client.get(url, {"board_id": board.pk, "swimlane": "todo"})
+
+    # then
+    assert groups_response.context["groups"] == [f"board_id={board.pk}&swimlane=todo"]
+    assert list(group_response.context["page"]) == [story]
+    assert f'data-pk="{story.pk}"' in group_response.content.decode()
+
+
+def test_reorder_view_lists_and_shows_group_of_null_value(
+    admin_client, note_factory, board
+):
+    # given
+    note = note_factory.create()
+    note_factory.create(board=board)
+    url = reverse("admin:tests_note_reorder")
+
+    # when
+    groups_response = admin_client.get(url)
+    group_response = admin_client.get(url, {"board_id": ""})
+
+    # then
+    assert sorted(groups_response.context["groups"]) == sorted(
+        ["board_id=", f"board_id={board.pk}"]
+    )
+    assert list(group_response.context["page"]) == [note]
+
+
+def test_reorder_view_paginates_groups(admin_client, task_factory, board_factory):
+    # given
+    boards = board_factory.create_batch(3)
+    for board in boards:
+        task_factory.create(board=board)
+    url = reverse("admin:tests_task_reorder")
+
+    # when
+    with patch.object(RankedModelAdmin, "reorder_page_size", 2):
+        first_response = admin_client.get(url)
+        second_response = admin_client.get(url, {"page": 2})
+
+    # then
+    assert first_response.context["groups"] == [
+        f"board_id={board.pk}" for board in boards[:2]
+    ]
+    assert second_response.context["groups"] == [f"board_id={boards[2].pk}"]
+
+
+def test_reorder_view_rejects_invalid_group(admin_client):
+    # when
+    response = admin_client.get(reverse("admin:tests_task_reorder"), {"board_id": "a"})
+
+    # then
+    assert response.status_code == 400
+
+
+def test_reorder_view_applies_a_batch_of_moves(admin_client, task_factory, board):
+    # given
+    first_task, second_task, third_task = task_factory.create_batch(3, board=board)
+    moves = [
+        {"pk": first_task.pk, "before": third_task.pk},
+        {"pk": second_task.pk, "after": first_task.pk},
+    ]
+
+    # when
+    response = admin_client.post(
+        reverse("admin:tests_task_reorder"),
+        json.dumps({"moves": moves}),
+        content_type="application/json",
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.json() == {"moved": 2}
+    assert list(Task.objects.filter(board=board)) == [
+        first_task,
+        second_task,
+        third_task,
+    ]
+
+
+def test_reorder_view_rejects_invalid_moves(admin_client, task_factory):
+    # given
+    task, another_task = task_factory.create_batch(2)
+    url = reverse("admin:tests_task_reorder")
+
+    # when
+    responses = [
+        admin_client.post(url, body, content_type="application/json")
+        for body in [
+            "not json",
+            json.dumps({"moves": {"pk": task.pk}}),
+            json.dumps({"moves": [{"pk": task.pk, "after": another_task.pk}]}),
+            json.dumps({"moves": [{"pk": "abc", "after": task.pk}]}),
+        ]
+    ]
+
+    # then
+    assert [response.status_code for response in responses] == [400] * 4
+    assert "same group" in responses[2].json()["error"]
+
+
+def test_reorder_view_requires_change_permission(
+    client, django_user_model, task_factory, board
+):
+    # given
+    user = django_user_model.objects.create_user("staff", is_staff=True)
+    client.force_login(user)
+    first_task, second_task = task_factory.create_batch(2, board=board)
+    ranks = list(Task.objects.values_list("pk", "rank"))
+    url = reverse("admin:tests_task_reorder")
+
+    # when
+    get_response = client.get(url)
+    post_response = client.post(
+        url,
+        json.dumps({"moves": [{"pk": first_task.pk, "after": second_task.pk}]}),
+        content_type="application/json",
+    )
+
+    # then
+    assert get_response.status_code == 403
+    assert post_response.status_code == 403
+    assert list(Task.objects.values_list("pk", "rank")) == ranks
@@ -0,0 +1,130 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from django_lexorank.lexorank import LexoRank
+from django_lexorank.models import ScheduledRebalancing
+
+from .models import Story
+
+
+def test_rebalance_ranks_command_rebalances_groups_requiring_rebalancing(
+    task_factory, board_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task = task_factory.create(board=board, rank="d" * LexoRank.rebalancing_length)
+    another_task = task_factory.create(board=another_board, rank="dd")
+    out = StringIO()
+
+    # when
+    call_command("rebalance_ranks", "tests.Task", stdout=out)
+
+    # then
+    task.refresh_from_db()
+    another_task.refresh_from_db()
+    assert len(task.rank) == LexoRank.default_rank_length
+    assert another_task.rank == "dd"
+    assert "tests.Task: 1 group(s) rebalanced." in out.getvalue()
+
+
+def test_rebalance_ranks_command_rebalances_all_groups_with_all_option(
+    task_factory, board_factory
+):
+    # given
+    task = task_factory.create(rank="dd")
+    out = StringIO()
+
+    # when
+    call_command("rebalance_ranks", "tests.Task", "--all", stdout=out)
+
+    # then
+    task.refresh_from_db()
+    assert len(task.rank) == LexoRank.default_rank_length
+
+
+def test_rebalance_ranks_command_assigns_shortest_ranks_with_compact_option(task):
+    # when
+    call_command("rebalance_ranks", "tests.Task", "--all", "--compact")
+
+    # then
+    task.refresh_from_db()
+    assert len(task.rank) == LexoRank.get_compact_rank_length(objects_count=1)
+
+
+def test_rebalance_ranks_command_rebalances_scheduled_groups_with_scheduled_option(
+    task_factory, board_factory, story_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task = task_factory.create(board=board, rank="dd")
+    another_task = task_factory.create(board=another_board, rank="dd")
+    story = story_factory.create(board=board, swimlane="todo", rank="dd")
+    task.schedule_rebalancing()
+    story.schedule_rebalancing()
+    out = StringIO()
+
+    # when
+    call_command(
+        "rebalance_ranks", "tests.Task", "tests.Story", "--scheduled", stdout=out
+    )
+
+    # then
+    task.refresh_from_db()
+    another_task.refresh_from_db()
+    assert len(task.rank) == LexoRank.default_rank_length
+    assert another_task.rank == "dd"
+    assert len(Story.objects.get(pk=story.pk).rank) == LexoRank.default_rank_length
+    assert not ScheduledRebalancing.objects.exists()
+    assert "tests.Story: 1 group(s) rebalanced." in out.getvalue()
+
+
+def test_rebalance_ranks_command_rebalances_scheduled_group_of_null_value(
+    note_factory, board
+):
+    # given
+    note = note_factory.create(rank="dd")
+    another_note = note_factory.create(board=board, rank="dd")
+    note.schedule_rebalancing()
+    out = StringIO()
+
+    # when
+    call_command("rebalance_ranks", "tests.Note", "--scheduled", stdout=out)
+
+    # then
+    note.refresh_from_db()
+    another_note.refresh_from_db()
+    assert len(note.rank) == LexoRank.default_rank_length
+    assert another_note.rank == "dd"
+    assert not ScheduledRebalancing.objects.exists()
+    assert "tests.Note: 1 group(s) rebalanced." in out.getvalue()
+
+
+def test_rebalance_ranks_command_rejects_models_that_are_not_ranked():
+    with pytest.raises(CommandError):
+        call_command("rebalance_ranks", "django_lexorank.ScheduledRebalancing")
+
+
+def test_lexorank_stats_command_outputs_statistics_as_json(task_factory, board):
+    # given
+    task_factory.create_batch(2, board=board, rank="dd")
+    out = StringIO()
+
+    # when
+    call_command("lexorank_stats", "tests.Task", "--json", stdout=out)
+
+    # then
+    stats = json.loads(out.getvalue())
+    assert stats["rebalancing_length"] == LexoRank.rebalancing_length
+    assert stats["models"]["tests.Task"] == [
+        {
+            "group": board.pk,
+            "objects_count": 2,
+            "max_rank_length": 2,
+            "avg_rank_length": 2,
+            "duplicate_ranks": 1,
+            "rebalancing_required": False,
+        }
+    ]
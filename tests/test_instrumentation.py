@@ -0,0 +1,112 @@
+import logging
+from unittest import mock
+
+import pytest
+
+from django_lexorank.instrumentation import StatsdReceiver, log_ranking_operation
+from django_lexorank.lexorank import LexoRank
+from django_lexorank.signals import ranking_operation
+
+from .models import Board, Task
+
+
+@pytest.fixture
+def connect_receiver():
+    receivers = []
+
+    def connect(receiver):
+        ranking_operation.connect(receiver)
+        receivers.append(receiver)
+        return receiver
+
+    yield connect
+
+    for receiver in receivers:
+        ranking_operation.disconnect(receiver)
+
+
+@pytest.fixture
+def receiver(connect_receiver):
+    return connect_receiver(mock.Mock())
+
+
+def test_placing_ranked_model_sends_ranking_operation_signal(
+    task_factory, board, receiver
+):
+    # given
+    tasks = task_factory.create_batch(3, board=board)
+    receiver.reset_mock()
+
+    # when
+    task = tasks[0].place_on_bottom()
+
+    # then
+    receiver.assert_called_once()
+    kwargs = receiver.call_args.kwargs
+    assert kwargs["sender"] is Task
+    assert kwargs["operation"] == "place_on_bottom"
+    assert kwargs["instance"] == task
+    assert kwargs["group"] == board.pk
+    assert kwargs["queries"] > 0
+    assert kwargs["duration"] > 0
+    assert kwargs["rank_length"] == len(task.rank)
+    assert not kwargs["rebalancing_scheduled"]
+
+
+def test_creating_ranked_model_sends_pre_save_operation(receiver):
+    # when
+    board = Board.objects.create(name="Board")
+
+    # then
+    receiver.assert_called_once()
+    kwargs = receiver.call_args.kwargs
+    assert kwargs["operation"] == "pre_save"
+    assert kwargs["group"] == ""
+    assert kwargs["rank_length"] == len(board.rank)
+
+
+def test_ranking_operation_reports_scheduled_rebalancing(board_factory, receiver):
+    # given
+    boards = board_factory.create_batch(3)
+    receiver.reset_mock()
+
+    # when
+    with mock.patch.object(LexoRank, "rebalancing_length", 1):
+        boards[0].place_on_top()
+
+    # then
+    operations = {
+        call.kwargs["operation"]: call.kwargs["rebalancing_scheduled"]
+        for call in receiver.call_args_list
+    }
+    assert operations == {"schedule_rebalancing": True, "place_on_top": True}
+
+
+def test_log_ranking_operation_logs_operation(board, caplog, connect_receiver):
+    # given
+    connect_receiver(log_ranking_operation)
+
+    # when
+    with caplog.at_level(logging.INFO, logger="django_lexorank"):
+        board.rebalance()
+
+    # then
+    assert "tests.Board.rebalance" in caplog.text
+
+
+def test_statsd_receiver_reports_metrics(board, connect_receiver):
+    # given
+    client = mock.Mock()
+    connect_receiver(StatsdReceiver(client))
+
+    # when
+    board.place_on_top()
+
+    # then
+    client.timing.assert_called_once_with(
+        "lexorank.tests.board.place_on_top.duration", mock.ANY
+    )
+    client.gauge.assert_any_call(
+        "lexorank.tests.board.place_on_top.rank_length", len(board.rank)
+    )
+    client.incr.assert_not_called()
@@ -0,0 +1,145 @@
+from unittest import mock
+
+import pytest
+
+from django_lexorank import lexorank
+from django_lexorank.lexorank import LexoRank, Rank
+
+
+def test_rank_caches_integer_value_and_length():
+    # when
+    rank = Rank("bc")
+
+    # then
+    assert rank.value == LexoRank.base + 2
+    assert rank.length == 2
+    assert str(rank) == "bc"
+
+
+def test_rank_compares_like_strings():
+    ranks = ["b", "ba", "bab", "bb", "c", "zz"]
+
+    assert sorted(Rank(rank) for rank in reversed(ranks)) == ranks
+    assert Rank("ba") < "bb"
+    assert Rank("0|zz") < Rank("1|aa")
+
+
+def test_rank_is_equal_and_hashes_like_its_string():
+    assert Rank("0|hzz") == "0|hzz"
+    assert {Rank("hzz"), "hzz"} == {"hzz"}
+
+
+def test_rank_is_immutable():
+    rank = Rank("hzz")
+
+    with pytest.raises(AttributeError):
+        rank.value = 0
+
+
+def test_rank_midpoint_extends_the_length_only_without_free_ranks():
+    assert Rank("b").midpoint(Rank("d")) == "c"
+    assert Rank("b").midpoint(Rank("c")) == "bn"
+    assert Rank("b").midpoint(Rank("bb")) == "ban"
+
+
+def test_adding_a_step_to_rank_carries_over_to_a_longer_rank():
+    assert Rank("az") + 1 == "ba"
+    assert Rank("zz") + 1 == "baa"
+
+
+def test_increment_rank_matches_iter_ranks():
+    ranks = list(LexoRank.iter_ranks(objects_count=1000))
+
+    assert ranks[1] == LexoRank.increment_rank(ranks[0], objects_count=1000)
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == 1000
+
+
+def test_rank_to_int_and_int_to_rank_are_inverse():
+    for rank in ["a", "z", "hzzzzz", "abcdefg"]:
+        value = LexoRank.rank_to_int(rank)
+        assert LexoRank.int_to_rank(value, len(rank)) == rank
+
+
+@pytest.mark.parametrize("objects_count", [0, 1, 1000, 30000])
+def test_rank_sequence_matches_iter_ranks(objects_count):
+    assert LexoRank.get_rank_sequence(objects_count) == list(
+        LexoRank.iter_ranks(objects_count=objects_count)
+    )
+
+
+def test_rank_sequence_without_numpy_matches_iter_ranks():
+    with mock.patch.object(lexorank, "numpy", None):
+        ranks = LexoRank.get_rank_sequence(objects_count=1000)
+
+    assert ranks == list(LexoRank.iter_ranks(objects_count=1000))
+
+
+def test_rank_sequence_of_odd_rank_length_matches_iter_ranks():
+    with mock.patch.object(LexoRank, "default_rank_length", 7):
+        ranks = LexoRank.get_rank_sequence(objects_count=1000)
+        expected_ranks = list(LexoRank.iter_ranks(objects_count=1000))
+
+    assert ranks == expected_ranks
+
+
+def test_rank_sequence_buffer_contains_fixed_width_ranks():
+    buffer = LexoRank.get_rank_sequence_buffer(objects_count=3)
+
+    assert buffer.decode() == "".join(LexoRank.iter_ranks(objects_count=3))
+
+
+def test_random_rank_is_picked_from_the_central_half_of_the_gap():
+    previous_value = LexoRank.rank_to_int("bbbbbb")
+    next_value = LexoRank.rank_to_int("yyyyyy")
+    quarter = (next_value - previous_value) // 4
+
+    for _ in range(100):
+        rank = LexoRank.get_random_lexorank_in_between(
+            previous_rank="bbbbbb", next_rank="yyyyyy", objects_count=10
+        )
+        assert len(rank) == 6
+        value = LexoRank.rank_to_int(rank)
+        assert previous_value + quarter <= value <= next_value - quarter
+
+
+def test_random_rank_is_extended_to_fit_entropy_digits():
+    rank = LexoRank.get_random_lexorank_in_between(
+        previous_rank="hzzzzz", next_rank="iaaaab", objects_count=10, entropy_digits=2
+    )
+
+    assert "hzzzzz" < rank < "iaaaab"
+    assert len(rank) == 8
+
+
+def test_random_ranks_between_the_same_neighbours_rarely_collide():
+    ranks = [
+        LexoRank.get_random_lexorank_in_between(
+            previous_rank=None, next_rank="aaaaab", objects_count=10, entropy_digits=3
+        )
+        for _ in range(100)
+    ]
+
+    assert len(set(ranks)) > 95
+    assert all(rank < "aaaaab" for rank in ranks)
+
+
+def test_random_rank_keeps_the_bucket_of_neighbours():
+    rank = LexoRank.get_random_lexorank_in_between(
+        previous_rank="1|hzzzzz", next_rank=None, objects_count=10
+    )
+
+    assert rank.startswith("1|")
+    assert rank > "1|hzzzzz"
+
+
+def test_get_length_does_not_include_bucket_prefix():
+    assert LexoRank.get_length("0|hzz") == 3
+    assert LexoRank.get_length(Rank("1|hz")) == 2
+    assert LexoRank.get_length("hzzz") == 4
+
+
+def test_split_neighbour_buckets_places_between_bucketed_and_legacy_ranks():
+    assert LexoRank.split_neighbour_buckets("0|x", "b") == (None, None, "b")
+    assert LexoRank.split_neighbour_buckets("b", "m") == (None, "b", "m")
+    assert LexoRank.split_neighbour_buckets(None, "b") == (None, None, "b")
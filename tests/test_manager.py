@@ -1,10 +1,15 @@
+import datetime
+import random
 from unittest import mock
 
 import pytest
+from asgiref.sync import async_to_sync
 
+from django_lexorank import lexorank
 from django_lexorank.lexorank import LexoRank
 
-from .models import Board, Task, User
+from .markers import requires_async_orm
+from .models import Board, Label, Story, Task, User
 
 
 def test_creating_a_ranked_model_gives_it_a_rank():
@@ -130,3 +135,415 @@ def test_rebalancing_is_scheduled_if_new_objects_rank_exceeds_the_max_length_whe
 
     # then
     assert board.rebalancing_scheduled()
+
+
+@requires_async_orm
+def test_creating_a_ranked_model_using_aadd_to_top_method_add_it_to_the_top_of_the_list(  # noqa: E501
+    board_factory,
+):
+    # given
+    batch_size = 10
+    board_factory.create_batch(batch_size)
+
+    # when
+    board = async_to_sync(Board.objects.aadd_to_top)(name="Board")
+
+    # then
+    assert Board.objects.count() == batch_size + 1
+    assert Board.objects.order_by("rank").first() == board
+
+
+@requires_async_orm
+def test_creating_a_ranked_model_using_aadd_to_bottom_method_add_it_to_the_bottom_of_the_list(  # noqa: E501
+    task_factory, board, user
+):
+    # given
+    batch_size = 10
+    task_factory.create_batch(batch_size, board=board)
+
+    # when
+    task = async_to_sync(Task.objects.aadd_to_bottom)(
+        name="Task", board=board, assigned_to=user
+    )
+
+    # then
+    assert Task.objects.filter(board=board).count() == batch_size + 1
+    assert Task.objects.filter(board=board).order_by("rank").last() == task
+
+
+def test_place_many_after_places_objects_as_a_block_keeping_their_order(
+    board_factory, django_assert_num_queries
+):
+    # given
+    board_factory.create_batch(10)
+    boards = list(Board.objects.order_by("rank"))
+    selected = [boards[7], boards[0], boards[5]]
+
+    # when
+    with django_assert_num_queries(5):
+        placed = Board.objects.place_many_after(selected, after_obj=boards[2])
+
+    # then
+    assert placed == [boards[0], boards[5], boards[7]]
+    assert list(Board.objects.order_by("rank")) == [
+        boards[1],
+        boards[2],
+        boards[0],
+        boards[5],
+        boards[7],
+        boards[3],
+        boards[4],
+        boards[6],
+        boards[8],
+        boards[9],
+    ]
+
+
+def test_place_many_before_moves_objects_from_another_group(
+    task_factory, board_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task_factory.create_batch(3, board=board)
+    tasks = list(Task.objects.filter(board=board).order_by("rank"))
+    other_tasks = task_factory.create_batch(2, board=another_board)
+
+    # when
+    Task.objects.place_many_before(other_tasks, before_obj=tasks[0])
+
+    # then
+    ordered = list(Task.objects.filter(board=board).order_by("rank"))
+    assert ordered[:2] == sorted(other_tasks, key=lambda task: task.rank)
+    assert ordered[2:] == tasks
+    assert not Task.objects.filter(board=another_board).exists()
+
+
+def test_place_many_after_rebalances_the_group_when_the_gap_is_too_small(
+    board_factory,
+):
+    # given
+    previous_board = board_factory.create(rank="b" * 10)
+    next_board = board_factory.create(rank="b" * 9 + "c")
+    selected = board_factory.create_batch(3)
+
+    # when
+    with mock.patch.object(LexoRank, "rebalancing_length", 11):
+        Board.objects.place_many_after(selected, after_obj=previous_board)
+
+    # then
+    assert list(Board.objects.order_by("rank"))[1:4] == sorted(
+        selected, key=lambda board: board.rank
+    )
+    assert {len(board.rank) for board in Board.objects.all()} == {
+        LexoRank.default_rank_length
+    }
+    next_board.refresh_from_db()
+    assert Board.objects.order_by("rank").last() == next_board
+
+
+def test_rank_by_assigns_ranks_according_to_provided_ordering(
+    task_factory, board_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    for name in ["b", "d", "a", "c"]:
+        task_factory.create(board=board, name=name)
+    another_task = task_factory.create(board=another_board, rank="dd")
+
+    # when
+    ranked = Task.objects.filter(board=board, name="a").rank_by("-name")
+
+    # then
+    another_task.refresh_from_db()
+    assert ranked == 4
+    assert list(
+        Task.objects.filter(board=board).order_by("rank").values_list("name", flat=True)
+    ) == ["d", "c", "b", "a"]
+    assert {
+        len(rank)
+        for rank in Task.objects.filter(board=board).values_list("rank", flat=True)
+    } == {LexoRank.default_rank_length}
+    assert another_task.rank == "dd"
+
+
+def test_rank_by_keeps_current_order_for_ties(board_factory):
+    # given
+    board_factory.create_batch(5, name="board")
+    boards = list(Board.objects.order_by("rank"))
+
+    # when
+    Board.objects.rank_by("name")
+
+    # then
+    assert list(Board.objects.order_by("rank")) == boards
+
+
+@pytest.mark.parametrize(
+    "ordering, expected_names",
+    [("due_date", ["early", "late", "none"]), ("-due_date", ["none", "late", "early"])],
+)
+def test_rank_by_places_nulls_last_in_ascending_order(
+    ordering, expected_names, task_factory, board
+):
+    # given
+    task_factory.create(board=board, name="none", due_date=None)
+    task_factory.create(board=board, name="late", due_date=datetime.date(2024, 2, 1))
+    task_factory.create(board=board, name="early", due_date=datetime.date(2024, 1, 1))
+
+    # when
+    Task.objects.filter(board=board).rank_by(ordering)
+
+    # then
+    assert [task.name for task in Task.objects.filter(board=board)] == expected_names
+
+
+def test_rank_by_does_nothing_for_empty_queryset(board_factory):
+    # given
+    board_factory.create_batch(3)
+    ranks = list(Board.objects.values_list("rank", flat=True))
+
+    # when
+    ranked = Board.objects.filter(pk__in=[]).rank_by("name")
+
+    # then
+    assert ranked == 0
+    assert list(Board.objects.values_list("rank", flat=True)) == ranks
+
+
+def test_rank_by_requires_all_objects_of_model_ranked_globally(board_factory):
+    # given
+    board, another_board = board_factory.create_batch(2)
+
+    # then
+    with pytest.raises(ValueError):
+        Board.objects.filter(pk=board.pk).rank_by("name")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_clone_group_copies_objects_keeping_their_order(
+    compact, task_factory, board_factory, django_assert_max_num_queries
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    for rank in ["c", "cb", "cbb", "d"]:
+        task_factory.create(board=board, rank=rank)
+    names = list(
+        Task.objects.filter(board=board).order_by("rank").values_list("name", flat=True)
+    )
+
+    # when
+    with django_assert_max_num_queries(5):
+        clones = Task.objects.clone_group(board, another_board, compact=compact)
+
+    # then
+    assert len(clones) == 4
+    cloned = Task.objects.filter(board=another_board).order_by("rank")
+    assert [task.name for task in cloned] == names
+    ranks = [task.rank for task in cloned]
+    if compact:
+        assert ranks == list(LexoRank.iter_ranks(objects_count=4))
+    else:
+        assert ranks == ["c", "cb", "cbb", "d"]
+    assert Task.objects.filter(board=board).count() == 4
+
+
+def test_clone_group_requires_empty_destination(task_factory, board_factory):
+    # given
+    task, another_task = task_factory.create_batch(2)
+
+    # then
+    with pytest.raises(ValueError):
+        Task.objects.clone_group(task.board, another_task.board)
+
+
+def test_clone_group_requires_auto_primary_key(board_factory):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    Label.objects.create(code="bug", board=board)
+
+    # then
+    with pytest.raises(ValueError):
+        Label.objects.clone_group(board, another_board)
+    assert not Label.objects.filter(board=another_board).exists()
+
+
+@pytest.mark.parametrize(
+    "strategy, expected_names",
+    [
+        ("append", ["a1", "a2", "b1", "b2"]),
+        ("interleave", ["a1", "b1", "a2", "b2"]),
+    ],
+)
+def test_merge_groups_moves_objects_and_ranks_them_according_to_strategy(
+    strategy, expected_names, task_factory, board_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task_factory.create(board=board, name="a1", rank="c")
+    task_factory.create(board=board, name="a2", rank="m")
+    task_factory.create(board=another_board, name="b1", rank="d")
+    task_factory.create(board=another_board, name="b2", rank="n")
+
+    # when
+    merged = Task.objects.merge_groups(another_board, board, strategy=strategy)
+
+    # then
+    assert merged == 4
+    assert not Task.objects.filter(board=another_board).exists()
+    assert (
+        list(
+            Task.objects.filter(board=board)
+            .order_by("rank")
+            .values_list("name", flat=True)
+        )
+        == expected_names
+    )
+
+
+def test_adding_objects_with_jitter_digits_picks_random_ranks_from_the_same_gap():
+    # given
+    board = Board.objects.add_to_top(name="Board")
+    ranks, orders = [], []
+
+    # when
+    with mock.patch.object(Board._meta.get_field("rank"), "jitter_digits", 2):
+        for seed in [0, 1, 0]:
+            with mock.patch.object(lexorank, "_random", random.Random(seed)):
+                new_board = Board.objects.add_to_top(name="New board")
+            ranks.append(new_board.rank)
+            orders.append(list(Board.objects.all()) == [new_board, board])
+            new_board.delete()
+
+    # then
+    assert ranks[0] != ranks[1]
+    assert ranks[0] == ranks[2]
+    assert all(orders)
+
+
+def test_adding_objects_skips_objects_out_of_ranking_scope(story_factory, board):
+    # given
+    story = story_factory.create(board=board, swimlane="todo")
+    story_factory.create(board=board, swimlane="todo", archived=True, rank="0")
+
+    # when
+    new_story = Story.objects.add_to_top(board=board, swimlane="todo", name="new")
+
+    # then
+    assert new_story.rank == LexoRank.get_lexorank_in_between(
+        previous_rank=None, next_rank=story.rank, objects_count=1
+    )
+    assert list(Story.get_ranked_queryset()) == [new_story, story]
+
+
+def test_adding_objects_resolves_group_from_attnames_and_field_defaults(
+    story_factory, task_factory, board
+):
+    # given
+    story = story_factory.create(board=board)
+    story_factory.create(board=board, swimlane="todo")
+    task = task_factory.create(board=board)
+
+    # when
+    new_story = Story.objects.add_to_top(board=board, name="new")
+    new_task = Task.objects.add_to_bottom(
+        board_id=board.pk, assigned_to=task.assigned_to, name="new"
+    )
+
+    # then
+    assert new_story.swimlane == ""
+    assert list(Story.objects.filter(board=board, swimlane="")) == [new_story, story]
+    assert list(Task.objects.filter(board=board)) == [task, new_task]
+
+
+def test_merge_groups_of_multiple_fields_keeps_objects_out_of_ranking_scope(
+    story_factory, board
+):
+    # given
+    story_factory.create(board=board, swimlane="todo", name="a1", rank="c")
+    story_factory.create(board=board, swimlane="done", name="b1", rank="d")
+    archived = story_factory.create(
+        board=board, swimlane="done", name="b2", rank="e", archived=True
+    )
+
+    # when
+    merged = Story.objects.merge_groups((board, "done"), (board, "todo"))
+
+    # then
+    assert merged == 2
+    archived.refresh_from_db()
+    assert (archived.swimlane, archived.rank) == ("todo", "e")
+    assert list(
+        Story.get_ranked_queryset().order_by("rank").values_list("name", flat=True)
+    ) == ["a1", "b1"]
+
+
+def test_rank_by_ranks_groups_of_multiple_fields_within_ranking_scope(
+    story_factory, board
+):
+    # given
+    story_factory.create(board=board, swimlane="todo", name="b")
+    story_factory.create(board=board, swimlane="todo", name="a")
+    story_factory.create(board=board, swimlane="done", name="c")
+    archived = story_factory.create(board=board, swimlane="todo", archived=True)
+
+    # when
+    ranked = Story.objects.filter(swimlane="todo", name="a").rank_by("name")
+
+    # then
+    assert ranked == 2
+    assert list(
+        Story.get_ranked_queryset()
+        .filter(swimlane="todo")
+        .values_list("name", flat=True)
+    ) == ["a", "b"]
+    assert Story.objects.get(pk=archived.pk).rank == archived.rank
+
+
+def test_apply_moves_applies_dependent_moves_in_order(
+    task_factory, board, django_assert_max_num_queries
+):
+    # given
+    tasks = list(reversed(task_factory.create_batch(5, board=board)))
+    moves = [
+        {"pk": tasks[0].pk, "after": tasks[4].pk},
+        {"pk": tasks[1].pk, "after": tasks[0].pk},
+        {"pk": tasks[3].pk, "before": tasks[2].pk},
+    ]
+
+    # when
+    with django_assert_max_num_queries(len(moves) + 6):
+        moved = Task.objects.apply_moves(moves)
+
+    # then
+    assert moved == [tasks[0], tasks[1], tasks[3]]
+    assert list(Task.objects.filter(board=board)) == [
+        tasks[3],
+        tasks[2],
+        tasks[4],
+        tasks[0],
+        tasks[1],
+    ]
+
+
+def test_apply_moves_skips_objects_out_of_ranking_scope(story_factory, board):
+    # given
+    first_story, archived_story, third_story = reversed(
+        story_factory.create_batch(3, board=board)
+    )
+    Story.objects.filter(pk=archived_story.pk).update(archived=True)
+
+    # when
+    Story.objects.apply_moves([{"pk": third_story.pk, "before": first_story.pk}])
+
+    # then
+    assert list(Story.get_ranked_queryset()) == [third_story, first_story]
+    with pytest.raises(Story.DoesNotExist):
+        Story.objects.apply_moves([{"pk": third_story.pk, "after": archived_story.pk}])
+
+
+def test_apply_moves_requires_a_target(task):
+    with pytest.raises(ValueError):
+        Task.objects.apply_moves([{"pk": task.pk}])
+
+    with pytest.raises(ValueError):
+        Task.objects.apply_moves([{"pk": task.pk, "after": task.pk}])
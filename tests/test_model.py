@@ -1,10 +1,14 @@
 from unittest import mock
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.db import connections
 
-from django_lexorank.lexorank import LexoRank
+from django_lexorank.lexorank import LexoRank, Rank
+from django_lexorank.models import ScheduledRebalancing
 
-from .models import Board, Task, User
+from .markers import requires_async_orm
+from .models import Board, Card, Story, Task, User
 
 
 def test_placing_ranked_model_after_another_change_it_rank_respectively(board_factory):
@@ -227,6 +231,25 @@ def test_rebalancing_required_return_false_for_any_object_when_rank_length_is_no
             assert not board.rebalancing_required()
 
 
+def test_rebalancing_length_of_bucketed_ranks_does_not_include_bucket_prefix(
+    card_factory, board
+):
+    # given
+    card = card_factory.create(board=board, rank="0|" + "d" * 9)
+
+    # when
+    with mock.patch.object(LexoRank, "rebalancing_length", 10):
+        required = card.rebalancing_required()
+        groups = Card.get_groups_requiring_rebalancing()
+        stats = Card.get_rank_stats()
+
+    # then
+    assert not required
+    assert groups == []
+    assert stats[0]["max_rank_length"] == 9
+    assert not stats[0]["rebalancing_required"]
+
+
 def test_rebalancing_scheduled_return_false_if_no_rebalancing_were_scheduled(
     task_factory,
 ):
@@ -321,3 +344,918 @@ def test_field_value_has_changed_method_foreign_key(task, board_factory):
 
     # then
     assert task.field_value_has_changed("board")
+
+
+def test_field_value_has_changed_method_for_object_loaded_from_db(task, board_factory):
+    # given
+    task = Task.objects.get(pk=task.pk)
+    new_board = board_factory.create()
+
+    # when
+    task.board = new_board
+
+    # then
+    assert task.field_value_has_changed("board")
+
+
+def test_field_value_has_changed_method_after_save(task, board_factory):
+    # given
+    task.board = board_factory.create()
+
+    # when
+    task.save()
+
+    # then
+    assert not task.field_value_has_changed("board")
+
+
+def test_field_value_has_changed_method_does_not_load_deferred_fields(
+    task_factory, board, django_assert_num_queries
+):
+    # given
+    task_factory.create_batch(5, board=board)
+
+    # then
+    with django_assert_num_queries(1):
+        for task in Task.objects.only("id", "rank"):
+            assert not task.field_value_has_changed("board")
+            assert not task.field_value_has_changed("name")
+
+
+def test_field_value_has_changed_method_for_assigned_deferred_field(
+    task, board_factory
+):
+    # given
+    task = Task.objects.only("id", "rank").get(pk=task.pk)
+    new_board = board_factory.create()
+
+    # when
+    task.board = new_board
+
+    # then
+    assert task.field_value_has_changed("board")
+
+
+def test_field_value_has_changed_method_after_refresh_from_db(task, board_factory):
+    # given
+    new_board = board_factory.create()
+    Task.objects.filter(pk=task.pk).update(board=new_board)
+
+    # when
+    task.refresh_from_db()
+
+    # then
+    assert task.board == new_board
+    assert not task.field_value_has_changed("board")
+
+
+@requires_async_orm
+def test_aplacing_ranked_model_after_another_change_it_rank_respectively(
+    board_factory,
+):
+    # given
+    board_factory.create_batch(10)
+    boards = Board.objects.order_by("rank")
+    after_board = boards[3]
+    before_board = boards[4]
+
+    # when
+    board = async_to_sync(boards[0].aplace_after)(after_obj=after_board)
+
+    # then
+    board.refresh_from_db()
+    assert board.rank > after_board.rank
+    assert board.rank < before_board.rank
+
+
+@requires_async_orm
+def test_aplacing_ranked_model_before_another_change_it_rank_respectively(
+    board_factory,
+):
+    # given
+    board_factory.create_batch(10)
+    boards = Board.objects.order_by("rank")
+    after_board = boards[3]
+    before_board = boards[4]
+
+    # when
+    board = async_to_sync(boards[0].aplace_before)(before_obj=before_board)
+
+    # then
+    board.refresh_from_db()
+    assert board.rank > after_board.rank
+    assert board.rank < before_board.rank
+
+
+@requires_async_orm
+def test_aplacing_ranked_model_on_top_makes_it_rank_first(board_factory):
+    # given
+    boards = board_factory.create_batch(10)
+
+    # when
+    board = async_to_sync(boards[5].aplace_on_top)()
+
+    # then
+    assert Board.objects.order_by("rank").first() == board
+
+
+@requires_async_orm
+def test_aplacing_ranked_model_on_bottom_makes_it_rank_last(task_factory, board):
+    # given
+    tasks = task_factory.create_batch(10, board=board)
+
+    # when
+    task = async_to_sync(tasks[5].aplace_on_bottom)()
+
+    # then
+    assert Task.objects.filter(board=board).order_by("rank").last() == task
+
+
+@requires_async_orm
+def test_arebalancing_ranked_model_updates_the_ranks_according_to_the_order(
+    board_factory,
+):
+    # given
+    previous_board = board_factory.create(rank="bbbbbb")
+    next_board = board_factory.create(rank="bbbbbc")
+
+    # when
+    async_to_sync(previous_board.arebalance)()
+
+    # then
+    next_board.refresh_from_db()
+    assert previous_board.rank < next_board.rank
+    assert len(previous_board.rank) == LexoRank.default_rank_length
+    assert len(next_board.rank) == LexoRank.default_rank_length
+
+
+@pytest.mark.parametrize("objects_count", [1, 3, 30])
+def test_rebalancing_ranked_model_in_database_assigns_the_same_ranks_as_in_python(
+    objects_count, board_factory
+):
+    # given
+    boards = [board_factory.create(rank="b" * (i + 1)) for i in range(objects_count)]
+
+    boards[0].rebalance()
+    expected_ranks = list(Board.objects.order_by("rank").values_list("pk", "rank"))
+    Board.objects.update(rank="")
+    for i, board in enumerate(boards):
+        Board.objects.filter(pk=board.pk).update(rank="b" * (i + 1))
+
+    # when
+    boards[0].rebalance(in_database=True)
+
+    # then
+    assert list(Board.objects.order_by("rank").values_list("pk", "rank")) == (
+        expected_ranks
+    )
+    assert boards[0].rank == expected_ranks[0][1]
+
+
+def test_rebalancing_ranked_model_in_database_does_not_affect_objects_in_another_list(  # noqa: E501
+    task_factory,
+):
+    # given
+    task = task_factory.create(rank="aaa")
+    another_task = task_factory.create(rank="bbb")
+
+    # when
+    task.rebalance(in_database=True)
+
+    # then
+    another_task.refresh_from_db()
+    assert len(task.rank) == LexoRank.default_rank_length
+    assert another_task.rank == "bbb"
+
+
+def test_rebalancing_all_groups_in_database_keeps_the_order_in_each_group(
+    task_factory, board_factory
+):
+    # given
+    boards = board_factory.create_batch(3)
+    for board in boards:
+        for rank in ["c", "cb", "cbb", "d"]:
+            task_factory.create(board=board, rank=rank)
+
+    # when
+    updated = Task.rebalance_in_database()
+
+    # then
+    assert updated == 12
+    for board in boards:
+        ranks = list(
+            Task.objects.filter(board=board)
+            .order_by("pk")
+            .values_list("rank", flat=True)
+        )
+        assert ranks == sorted(ranks)
+        assert {len(rank) for rank in ranks} == {LexoRank.default_rank_length}
+
+
+def test_get_groups_requiring_rebalancing_returns_only_groups_with_long_ranks(
+    task_factory, board_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task_factory.create(board=board, rank="d" * LexoRank.rebalancing_length)
+    task_factory.create_batch(3, board=another_board)
+
+    # when
+    groups = Task.get_groups_requiring_rebalancing()
+
+    # then
+    assert groups == [board.pk]
+
+
+@pytest.mark.parametrize("in_database", [False, True])
+def test_rebalance_all_rebalances_groups_requiring_rebalancing(
+    in_database, task_factory, board_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task = task_factory.create(board=board, rank="d" * LexoRank.rebalancing_length)
+    another_task = task_factory.create(board=another_board, rank="dd")
+
+    # when
+    rebalanced = Task.rebalance_all(in_database=in_database)
+
+    # then
+    task.refresh_from_db()
+    another_task.refresh_from_db()
+    assert rebalanced == 1
+    assert len(task.rank) == LexoRank.default_rank_length
+    assert another_task.rank == "dd"
+
+
+def test_rebalance_all_rebalances_groups_concurrently(task_factory, board_factory):
+    # given
+    boards = board_factory.create_batch(4)
+    for board in boards:
+        task_factory.create(board=board)
+
+    # when
+    with mock.patch.object(Task, "rebalance_group") as rebalance_group:
+        rebalanced = Task.rebalance_all(groups=Task.get_groups(), workers=2)
+
+    # then
+    assert rebalanced == 4
+    assert sorted(
+        call.kwargs["with_respect_to_kwargs"]["board_id"]
+        for call in rebalance_group.call_args_list
+    ) == sorted(board.pk for board in boards)
+
+
+def test_rebalance_all_rebalances_groups_in_threads_against_the_database(
+    transactional_db, task_factory, board_factory
+):
+    # given
+    boards = board_factory.create_batch(6)
+    for board in boards:
+        task_factory.create_batch(
+            3, board=board, rank="d" * LexoRank.rebalancing_length
+        )
+    close_all = mock.Mock(wraps=connections.close_all)
+
+    # when
+    with mock.patch.object(connections, "close_all", close_all):
+        rebalanced = Task.rebalance_all(workers=2)
+
+    # then
+    assert rebalanced == 6
+    assert close_all.call_count == 2
+    assert Task.get_groups_requiring_rebalancing() == []
+
+
+def test_get_rank_stats_returns_statistics_per_group_in_a_single_query(
+    task_factory, board_factory, django_assert_num_queries
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task_factory.create(board=board, rank="d" * LexoRank.rebalancing_length)
+    task_factory.create(board=board, rank="dd")
+    task_factory.create_batch(2, board=another_board, rank="ee")
+
+    # when
+    with django_assert_num_queries(1):
+        stats = Task.get_rank_stats()
+
+    # then
+    assert stats == [
+        {
+            "group": board.pk,
+            "objects_count": 2,
+            "max_rank_length": LexoRank.rebalancing_length,
+            "avg_rank_length": (LexoRank.rebalancing_length + 2) / 2,
+            "duplicate_ranks": 0,
+            "rebalancing_required": True,
+        },
+        {
+            "group": another_board.pk,
+            "objects_count": 2,
+            "max_rank_length": 2,
+            "avg_rank_length": 2,
+            "duplicate_ranks": 1,
+            "rebalancing_required": False,
+        },
+    ]
+
+
+def test_with_neighbours_annotates_neighbour_ranks_in_a_single_query(
+    task_factory, board_factory, django_assert_num_queries
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task_factory.create_batch(5, board=board)
+    task_factory.create_batch(3, board=another_board)
+    expected = {
+        task.pk: (task.get_previous_object_rank(), task.get_next_object_rank())
+        for task in Task.objects.all()
+    }
+
+    # then
+    with django_assert_num_queries(1):
+        for task in Task.objects.with_neighbours(pks=True):
+            assert (
+                task.get_previous_object_rank(),
+                task.get_next_object_rank(),
+            ) == expected[task.pk]
+
+
+def test_with_neighbours_annotates_neighbour_pks(board_factory):
+    # given
+    board_factory.create_batch(3)
+    first, second, third = Board.objects.with_neighbours(pks=True).order_by("rank")
+
+    # then
+    assert (first.previous_pk, first.next_pk) == (None, second.pk)
+    assert (second.previous_pk, second.next_pk) == (first.pk, third.pk)
+    assert (third.previous_pk, third.next_pk) == (second.pk, None)
+
+
+def test_placing_ranked_model_after_annotated_object_queries_current_next_object(
+    board_factory,
+):
+    # given
+    board_factory.create_batch(10)
+    boards = Board.objects.with_neighbours().order_by("rank")
+    after_board, before_board = boards[3], boards[4]
+    board = Board.objects.order_by("rank").first()
+    Board.objects.filter(pk=before_board.pk).update(rank=after_board.rank + "n")
+
+    # when
+    board.place_after(after_obj=after_board)
+
+    # then
+    before_board.refresh_from_db()
+    assert after_board.rank < board.rank < before_board.rank
+
+
+def test_placing_objects_after_the_same_annotated_object_keeps_ranks_distinct(
+    board_factory,
+):
+    # given
+    board_factory.create_batch(5)
+    boards = list(Board.objects.with_neighbours(pks=True).order_by("rank"))
+    target, next_board = boards[1], boards[2]
+
+    # when
+    boards[3].place_after(target)
+    boards[4].place_after(target)
+    boards[0].place_before(next_board)
+
+    # then
+    assert (target.next_rank, target.next_pk) == (boards[4].rank, boards[4].pk)
+    assert list(Board.objects.all()) == [
+        boards[1],
+        boards[4],
+        boards[3],
+        boards[0],
+        boards[2],
+    ]
+    assert len({board.rank for board in Board.objects.all()}) == 5
+
+
+def test_get_position_returns_index_of_the_object_in_its_list(
+    task_factory, board_factory
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    task_factory.create_batch(3, board=another_board)
+    task_factory.create_batch(5, board=board)
+    tasks = Task.objects.filter(board=board).order_by("rank")
+
+    # then
+    assert [task.get_position() for task in tasks] == [0, 1, 2, 3, 4]
+
+
+def test_get_object_at_returns_object_at_the_position(task_factory, board):
+    # given
+    task_factory.create_batch(5, board=board)
+    tasks = list(Task.objects.filter(board=board).order_by("rank"))
+
+    # then
+    for position, task in enumerate(tasks):
+        assert (
+            Task.get_object_at(position, with_respect_to_kwargs={"board": board})
+            == task
+        )
+    assert Task.get_object_at(5, with_respect_to_kwargs={"board": board}) is None
+
+
+@pytest.mark.parametrize("position", [0, 1, 4, 9])
+def test_placing_ranked_model_at_position_moves_it_to_the_position(
+    position, board_factory
+):
+    # given
+    board_factory.create_batch(10)
+    board = Board.objects.order_by("rank")[5]
+
+    # when
+    board = board.place_at(position)
+
+    # then
+    assert board.get_position() == position
+    assert Board.get_object_at(position, with_respect_to_kwargs={}) == board
+
+
+def test_placing_ranked_model_at_position_past_the_end_places_it_on_bottom(
+    board_factory,
+):
+    # given
+    boards = board_factory.create_batch(5)
+
+    # when
+    board = boards[2].place_at(100)
+
+    # then
+    assert Board.objects.order_by("rank").last() == board
+
+
+def test_moving_ranked_model_to_group_places_it_after_provided_object(
+    task_factory, board_factory, django_assert_num_queries
+):
+    # given
+    board = board_factory.create()
+    task_factory.create_batch(5, board=board)
+    tasks = list(Task.objects.filter(board=board).order_by("rank"))
+    task = task_factory.create()
+
+    # when
+    with django_assert_num_queries(5):
+        task.move_to_group(board, after=tasks[1])
+
+    # then
+    task.refresh_from_db()
+    assert task.board == board
+    assert tasks[1].rank < task.rank < tasks[2].rank
+    assert not task.field_value_has_changed("board")
+
+
+def test_moving_ranked_model_to_group_places_it_before_provided_object(
+    task_factory, board_factory
+):
+    # given
+    board = board_factory.create()
+    task_factory.create_batch(5, board=board)
+    tasks = list(Task.objects.filter(board=board).order_by("rank"))
+    task = task_factory.create()
+
+    # when
+    task.move_to_group(board.pk, before=tasks[0])
+
+    # then
+    task.refresh_from_db()
+    assert task.board == board
+    assert task.rank < tasks[0].rank
+
+
+def test_moving_ranked_model_to_group_without_target_uses_insert_to_bottom(
+    user_factory, team, user
+):
+    # given
+    user_factory.create_batch(5, team=team)
+
+    # when
+    user.move_to_group(team)
+
+    # then
+    assert User.objects.filter(team=team).order_by("rank").last() == user
+
+
+def test_moving_ranked_model_to_group_rejects_target_from_another_group(
+    task_factory, board
+):
+    # given
+    task, another_task = task_factory.create_batch(2)
+
+    # then
+    with pytest.raises(ValueError):
+        task.move_to_group(board, after=another_task)
+
+
+def test_moving_ranked_model_to_group_schedules_rebalancing_for_destination_group(
+    task_factory, board
+):
+    # given
+    task = task_factory.create()
+    another_task = task_factory.create()
+
+    # when
+    with mock.patch.object(LexoRank, "rebalancing_length", 1):
+        task.move_to_group(board)
+
+    # then
+    assert task.rebalancing_scheduled()
+    assert not another_task.rebalancing_scheduled()
+
+
+def test_bucketed_rank_field_prefixes_ranks_with_default_bucket(card_factory, board):
+    # when
+    card = card_factory.create(board=board)
+    another_card = card_factory.create(board=board)
+
+    # then
+    assert card.rank.startswith("0|")
+    assert another_card.rank.startswith("0|")
+    assert list(Card.objects.filter(board=board)) == [another_card, card]
+
+
+def test_adding_bucketed_ranked_model_to_empty_group_prefixes_default_bucket(
+    board_factory,
+):
+    # given
+    board, another_board = board_factory.create_batch(2)
+
+    # when
+    card = Card.objects.add_to_top(board=board, name="Card")
+    another_card = Card.objects.add_to_bottom(board=another_board, name="Card")
+
+    # then
+    assert card.rank.startswith("0|")
+    assert another_card.rank.startswith("0|")
+
+
+def test_placing_bucketed_ranked_model_keeps_it_in_the_bucket(card_factory, board):
+    # given
+    first_card, second_card, third_card = card_factory.create_batch(3, board=board)
+
+    # when
+    third_card.place_after(first_card)
+
+    # then
+    assert third_card.rank.startswith("0|")
+    assert list(Card.objects.filter(board=board)) == [
+        second_card,
+        first_card,
+        third_card,
+    ]
+
+
+def test_saving_and_placing_bucketed_ranked_model_keeps_legacy_ranks_in_order(
+    card_factory, board
+):
+    # given
+    cards = card_factory.create_batch(3, board=board)
+    for card, rank in zip(cards, ["b", "m", "t"]):
+        Card.objects.filter(pk=card.pk).update(rank=rank)
+        card.refresh_from_db()
+    first_card, second_card, third_card = cards
+
+    # when
+    third_card.name = "Renamed"
+    third_card.save()
+    first_card.place_after(second_card)
+    new_card = card_factory.create(board=board)
+    moved_card = card_factory.create().move_to_group(board)
+
+    # then
+    ranks = list(Card.objects.filter(board=board).values_list("rank", flat=True))
+    assert not any(LexoRank.bucket_separator in rank for rank in ranks)
+    assert list(Card.objects.filter(board=board)) == [
+        moved_card,
+        new_card,
+        second_card,
+        first_card,
+        third_card,
+    ]
+
+
+def test_rebalancing_bucketed_ranked_model_moves_the_group_to_the_next_bucket(
+    card_factory, board
+):
+    # given
+    cards = card_factory.create_batch(5, board=board)
+    another_card = card_factory.create()
+    expected_order = list(Card.objects.filter(board=board))
+
+    for bucket in ["1", "2", "0"]:
+        # when
+        cards[0].rebalance()
+
+        # then
+        ranks = list(Card.objects.filter(board=board).values_list("rank", flat=True))
+        assert {rank[:2] for rank in ranks} == {f"{bucket}|"}
+        assert list(Card.objects.filter(board=board)) == expected_order
+
+    another_card.refresh_from_db()
+    assert another_card.rank.startswith("0|")
+
+
+def test_rebalancing_bucketed_ranked_model_resumes_interrupted_rebalancing(
+    card_factory, board
+):
+    # given
+    first_card = card_factory.create(board=board, rank="0|ccc")
+    second_card = card_factory.create(board=board, rank="0|ddd")
+    third_card = card_factory.create(board=board, rank="1|xxx")
+    new_card = card_factory.create(board=board)
+
+    # when
+    new_card.place_after(second_card)
+    moved_count = Card.rebalance_to_next_bucket(
+        with_respect_to_kwargs={"board_id": board.pk}, batch_size=1
+    )
+
+    # then
+    assert new_card.rank.startswith("0|")
+    assert moved_count == 3
+    assert list(Card.objects.filter(board=board)) == [
+        first_card,
+        second_card,
+        new_card,
+        third_card,
+    ]
+    assert set(Card.objects.filter(board=board).values_list("rank", flat=True)) == set(
+        Card.objects.filter(rank__startswith="1|").values_list("rank", flat=True)
+    )
+
+
+def test_rebalancing_bucketed_ranked_model_moves_ranks_without_bucket(
+    card_factory, board
+):
+    # given
+    with mock.patch.object(Card._meta.get_field("rank"), "bucketed", False):
+        cards = card_factory.create_batch(3, board=board)
+    cards.reverse()
+
+    # when
+    Card.rebalance_to_next_bucket(with_respect_to_kwargs={"board_id": board.pk})
+
+    # then
+    ranks = list(Card.objects.filter(board=board).values_list("rank", flat=True))
+    assert all(rank.startswith("0|") for rank in ranks)
+    assert list(Card.objects.filter(board=board)) == cards
+
+
+def test_rebalancing_bucketed_ranked_model_in_database_keeps_the_bucket_prefix(
+    card_factory, board
+):
+    # given
+    cards = card_factory.create_batch(3, board=board)
+    expected_order = list(Card.objects.filter(board=board))
+
+    # when
+    cards[0].rebalance(in_database=True)
+
+    # then
+    ranks = list(Card.objects.filter(board=board).values_list("rank", flat=True))
+    assert all(rank.startswith("0|") for rank in ranks)
+    assert list(Card.objects.filter(board=board)) == expected_order
+
+
+def test_compact_rebalancing_assigns_shortest_ranks_keeping_the_order(
+    board_factory,
+):
+    # given
+    boards = board_factory.create_batch(10)
+    expected_order = list(Board.objects.all())
+
+    # when
+    boards[0].rebalance(compact=True)
+
+    # then
+    ranks = list(Board.objects.values_list("rank", flat=True))
+    assert {len(rank) for rank in ranks} == {2}
+    assert list(Board.objects.all()) == expected_order
+
+
+def test_compact_rebalancing_leaves_gaps_between_objects(board_factory):
+    # given
+    boards = board_factory.create_batch(30)
+
+    # when
+    boards[0].rebalance(compact=True)
+
+    # then
+    values = [
+        LexoRank.rank_to_int(rank)
+        for rank in Board.objects.values_list("rank", flat=True)
+    ]
+    gaps = [next_value - value for value, next_value in zip(values, values[1:])]
+    assert min([values[0], *gaps]) > LexoRank.compact_rank_gap
+
+
+def test_placing_ranked_model_after_compact_rebalancing_keeps_short_ranks(
+    board_factory,
+):
+    # given
+    first_board, second_board, third_board = board_factory.create_batch(3)
+    first_board.rebalance(compact=True)
+    second_board.refresh_from_db()
+    third_board.refresh_from_db()
+
+    # when
+    third_board.place_after(second_board)
+
+    # then
+    assert len(third_board.rank) == len(first_board.rank)
+    assert list(Board.objects.all()) == [second_board, third_board, first_board]
+
+
+def test_compact_rebalancing_of_bucketed_ranked_model(card_factory, board):
+    # given
+    cards = card_factory.create_batch(5, board=board)
+    expected_order = list(Card.objects.filter(board=board))
+
+    # when
+    cards[0].rebalance(compact=True)
+
+    # then
+    ranks = list(Card.objects.filter(board=board).values_list("rank", flat=True))
+    assert all(rank.startswith("1|") and len(rank) == 4 for rank in ranks)
+    assert list(Card.objects.filter(board=board)) == expected_order
+
+
+def test_compact_rebalancing_in_database_is_not_supported(board):
+    with pytest.raises(ValueError):
+        board.rebalance(in_database=True, compact=True)
+
+
+def test_rank_field_returns_rank_objects_with_as_rank(board_factory):
+    # given
+    first_board, second_board, third_board = board_factory.create_batch(3)
+
+    with mock.patch.object(Board._meta.get_field("rank"), "as_rank", True):
+        # when
+        boards = list(Board.objects.all())
+        boards[2].place_after(boards[0])
+
+        # then
+        assert all(isinstance(board.rank, Rank) for board in boards[:2])
+        assert list(Board.objects.all()) == [third_board, first_board, second_board]
+
+
+def test_objects_out_of_ranking_scope_are_skipped_when_placing(story_factory, board):
+    # given
+    first_story, archived_story, third_story = story_factory.create_batch(
+        3, board=board
+    )
+    Story.objects.filter(pk=archived_story.pk).update(archived=True)
+
+    # when
+    first_story.place_after(third_story)
+
+    # then
+    assert third_story.get_next_object() == first_story
+    assert first_story._objects_count == 2
+    assert list(Story.get_ranked_queryset()) == [third_story, first_story]
+
+
+def test_rebalancing_does_not_rewrite_objects_out_of_ranking_scope(
+    story_factory, board
+):
+    # given
+    stories = story_factory.create_batch(3, board=board)
+    Story.objects.filter(pk=stories[1].pk).update(archived=True)
+    archived_rank = stories[1].rank
+
+    # when
+    stories[0].rebalance()
+
+    # then
+    stories[1].refresh_from_db()
+    assert stories[1].rank == archived_rank
+    assert Story.get_ranked_queryset().filter(rank=archived_rank).count() == 0
+
+
+def test_object_returning_to_ranking_scope_is_placed_again_if_its_rank_was_reused(
+    story_factory, board
+):
+    # given
+    first_story, third_story = story_factory.create_batch(2, board=board)
+    second_story = story_factory.create(board=board)
+    second_story.place_after(first_story)
+    second_story.archived = True
+    second_story.save()
+    new_story = story_factory.create(board=board)
+    new_story.place_after(first_story)
+
+    # when
+    second_story.archived = False
+    second_story.save()
+
+    # then
+    second_story.refresh_from_db()
+    ranks = list(Story.get_ranked_queryset().values_list("rank", flat=True))
+    assert len(set(ranks)) == len(ranks) == 4
+    assert Story.get_ranked_queryset().first() == second_story
+
+
+def test_saving_object_out_of_ranking_scope_keeps_its_rank(story_factory, board):
+    # given
+    story = story_factory.create(board=board, archived=True)
+    rank = story.rank
+
+    # when
+    story.name = "Renamed"
+    story.save()
+
+    # then
+    story.refresh_from_db()
+    assert story.rank == rank
+
+
+def test_objects_are_ranked_separately_per_combination_of_group_fields(
+    story_factory, board
+):
+    # given
+    todo_stories = story_factory.create_batch(2, board=board, swimlane="todo")
+    done_story = story_factory.create(board=board, swimlane="done")
+
+    # when
+    todo_stories[1].swimlane = "done"
+    todo_stories[1].save()
+
+    # then
+    assert todo_stories[0].get_previous_object() is None
+    assert todo_stories[0].get_next_object() is None
+    assert done_story.get_previous_object() == todo_stories[1]
+    assert Story.get_groups_requiring_rebalancing() == []
+    assert set(Story.get_groups()) == {(board.pk, "todo"), (board.pk, "done")}
+
+
+def test_moving_object_to_group_of_multiple_fields(story_factory, board_factory):
+    # given
+    board, another_board = board_factory.create_batch(2)
+    story = story_factory.create(board=board, swimlane="todo")
+    target_story = story_factory.create(board=another_board, swimlane="done")
+
+    # when
+    story.move_to_group((another_board, "done"), after=target_story)
+
+    # then
+    story.refresh_from_db()
+    assert (story.board, story.swimlane) == (another_board, "done")
+    assert target_story.get_next_object() == story
+
+    with pytest.raises(ValueError):
+        story.move_to_group(another_board)
+
+
+def test_rebalancing_of_multiple_field_groups_is_scheduled_with_json_key(
+    story_factory, board
+):
+    # given
+    story = story_factory.create(board=board, swimlane="todo")
+
+    # when
+    story.schedule_rebalancing()
+
+    # then
+    assert story.rebalancing_scheduled()
+    assert ScheduledRebalancing.objects.get().with_respect_to == (
+        f'["{board.pk}", "todo"]'
+    )
+
+
+def test_rebalance_all_rebalances_groups_of_multiple_fields(story_factory, board):
+    # given
+    stories = story_factory.create_batch(3, board=board, swimlane="todo")
+    story_factory.create(board=board, swimlane="done")
+    expected_order = list(reversed(stories))
+    stories[0].rank = "z" * LexoRank.rebalancing_length
+    Story.objects.bulk_update(stories[:1], ["rank"])
+
+    # when
+    rebalanced = Story.rebalance_all()
+
+    # then
+    assert rebalanced == 1
+    assert {row["group"] for row in Story.get_rank_stats()} == {
+        (board.pk, "todo"),
+        (board.pk, "done"),
+    }
+    assert list(Story.objects.filter(swimlane="todo")) == expected_order
+    assert max(len(story.rank) for story in Story.objects.all()) < 10
+
+
+def test_composite_index_is_added_for_ranking_groups():
+    # given
+    story_index, task_index = Story._meta.indexes[-1], Task._meta.indexes[-1]
+
+    # then
+    assert story_index.fields == ["board", "swimlane", "rank"]
+    assert story_index.condition == Story.ranking_scope
+    assert task_index.fields == ["board", "rank"]
+    assert task_index.condition is None
+    assert Board._meta.indexes == []
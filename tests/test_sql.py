@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.db import connection
+
+from django_lexorank.lexorank import LexoRank
+from django_lexorank.sql import get_rank_length_thresholds, get_rank_sql
+
+from .models import Task
+
+
+def select_rank(row_number: int, objects_count: int) -> str:
+    rank_sql = get_rank_sql(
+        row_number=str(row_number),
+        objects_count=str(objects_count),
+        vendor=connection.vendor,
+        default="'-'",
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {rank_sql}")
+        return cursor.fetchone()[0]
+
+
+def test_rank_sql_encodes_ranks_up_to_the_largest_threshold():
+    # given
+    max_objects_count, rank_length = get_rank_length_thresholds()[-1]
+
+    # when
+    rank = select_rank(1, max_objects_count)
+
+    # then
+    assert len(rank) == rank_length
+    assert LexoRank.get_min_rank(max_objects_count) < rank
+
+
+def test_rank_sql_falls_back_to_default_past_the_largest_threshold():
+    # given
+    max_objects_count, _ = get_rank_length_thresholds()[-1]
+
+    # when
+    rank = select_rank(1, max_objects_count + 1)
+
+    # then
+    assert rank == "-"
+
+
+def test_rebalancing_in_database_keeps_ranks_of_too_large_groups(task_factory, board):
+    # given
+    task_factory.create_batch(3, board=board)
+    ranks = list(Task.objects.values_list("pk", "rank"))
+
+    # when
+    with mock.patch(
+        "django_lexorank.sql.get_rank_length_thresholds",
+        return_value=[(2, LexoRank.get_rank_length(2))],
+    ):
+        Task.rebalance_in_database()
+
+    # then
+    assert list(Task.objects.values_list("pk", "rank")) == ranks